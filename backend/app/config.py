@@ -1,5 +1,6 @@
 import os
-from typing import List
+import re
+from typing import FrozenSet, List, Optional
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -21,7 +22,16 @@ class Settings:
 
         # CORS Settings
         cors_origins_str = os.getenv("CORS_ORIGINS")
-        self.cors_origins: List[str] = [origin.strip() for origin in cors_origins_str.split(',')]
+        cors_origins = [origin.strip() for origin in cors_origins_str.split(',')]
+        # Exact origins as a set for constant-time checks; wildcard-host origins such as
+        # https://*.example.com (but not a bare "*") are combined into a single regex
+        self.cors_origins: FrozenSet[str] = frozenset(
+            origin for origin in cors_origins if origin == "*" or "*" not in origin
+        )
+        cors_origin_patterns = [
+            re.escape(origin).replace(r"\*", "[^/]*") for origin in cors_origins if origin != "*" and "*" in origin
+        ]
+        self.cors_origin_regex: Optional[str] = "|".join(cors_origin_patterns) or None
 
         # Supabase Settings
         self.supabase_url: str = os.getenv("SUPABASE_URL")
@@ -47,6 +57,12 @@ class Settings:
         # OpenAI Settings
         self.openai_api_key: str = os.getenv("OPENAI_API_KEY")
         self.translation_target_language: str = os.getenv("TRANSLATION_TARGET_LANGUAGE", "Vietnamese")
+        self.openai_requests_per_minute: int = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "500"))
+        self.openai_tokens_per_minute: int = int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "200000"))
+
+        # Translation Memory Settings - optional embedding index for large series
+        self.tm_embedding_index_enabled: bool = os.getenv("TM_EMBEDDING_INDEX_ENABLED", "false").lower() == "true"
+        self.tm_embedding_model: str = os.getenv("TM_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
 
         # Validate required Supabase settings
         if not self.supabase_url:
@@ -59,6 +75,11 @@ class Settings:
         # Validate OpenAI settings (warn if not set, but don't fail)
         if not self.openai_api_key:
             print("Warning: OPENAI_API_KEY environment variable is not set. Translation features will not work.")
+        # The translation rate limiter refills at these rates, so they must be positive
+        if self.openai_requests_per_minute <= 0:
+            raise ValueError("OPENAI_REQUESTS_PER_MINUTE must be greater than 0")
+        if self.openai_tokens_per_minute <= 0:
+            raise ValueError("OPENAI_TOKENS_PER_MINUTE must be greater than 0")
 
     def _parse_language_config(self, env_var: str, default_value: str) -> List[str]:
         """Parse language configuration from environment variable"""
@@ -339,6 +339,31 @@ class TranslationResponse(BaseModel):
         from_attributes = True
 
 
+class BatchTranslationRequest(BaseModel):
+    """Request to translate several texts (e.g. all bubbles of a page) at once"""
+    source_texts: list[str]
+    target_language: Optional[str] = None
+    context: Optional[str] = None
+
+    class Config:
+        str_strip_whitespace = True
+        validate_assignment = True
+
+
+class BatchTranslationResponse(BaseModel):
+    """Batch translation response model, translations in the order of source_texts"""
+    success: bool
+    source_texts: list[str]
+    translated_texts: list[str]
+    target_language: str
+    processing_time: Optional[float] = None
+    model: Optional[str] = None
+    tokens_used: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
 class EnhancedTranslationRequest(BaseModel):
     """Enhanced translation request with series context"""
     source_text: str
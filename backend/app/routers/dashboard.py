@@ -61,7 +61,7 @@ async def get_dashboard_stats(
     - AI glossary entries
     """
     try:
-        stats = await dashboard_service.get_dashboard_stats()
+        stats = await dashboard_service.get_dashboard_stats(use_cache=True)
         return stats
         
     except Exception as e:
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Uplo
 from typing import List, Dict, Any, Optional
 import base64
 import asyncio
+import importlib.util
 import httpx
 from supabase import Client
 
@@ -18,7 +19,10 @@ except ImportError:
 
 try:
     from app.services.ocr_service import OCRService
-    OCR_SERVICE_AVAILABLE = True
+    # easyocr is only imported once the first reader is created; find_spec checks it without loading torch
+    OCR_SERVICE_AVAILABLE = importlib.util.find_spec("easyocr") is not None
+    if not OCR_SERVICE_AVAILABLE:
+        print("Warning: OCRService not available")
 except ImportError:
     OCR_SERVICE_AVAILABLE = False
     print("Warning: OCRService not available")
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any
 from app.auth import get_current_user
 from app.services.translation_service import TranslationService
@@ -6,15 +7,23 @@ from app.models import (
     TranslationRequest,
     TranslationResponse,
     EnhancedTranslationRequest,
+    BatchTranslationRequest,
+    BatchTranslationResponse,
     ApiResponse
 )
 
 router = APIRouter(prefix="/translation", tags=["translation"])
 
+# Global translation service instance, shared so its HTTP connection pool is reused
+translation_service = None
+
 
 def get_translation_service() -> TranslationService:
-    """Dependency to get translation service"""
-    return TranslationService()
+    """Dependency to get translation service (singleton pattern)"""
+    global translation_service
+    if translation_service is None:
+        translation_service = TranslationService()
+    return translation_service
 
 
 @router.post("/translate", response_model=ApiResponse, status_code=status.HTTP_200_OK)
@@ -66,6 +75,94 @@ async def translate_text(
         )
 
 
+@router.post("/translate-stream", status_code=status.HTTP_200_OK)
+async def translate_text_stream(
+    request: TranslationRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    translation_service: TranslationService = Depends(get_translation_service)
+):
+    """
+    Translate text and stream the translation as plain text while it is generated
+
+    Lets the client show the start of the translation without waiting for the
+    whole completion.
+    """
+    # Validate input
+    if not request.source_text or not request.source_text.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Source text cannot be empty"
+        )
+
+    stream = translation_service.translate_stream(
+        source_text=request.source_text,
+        target_language=request.target_language,
+        context=request.context
+    )
+
+    # Wait for the first piece so configuration and API errors still get an error status
+    try:
+        first_chunk = await stream.__anext__()
+    except StopAsyncIteration:
+        first_chunk = ""
+    except Exception as e:
+        print(f"❌ Streaming translation endpoint error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Translation failed: {str(e)}"
+        )
+
+    async def translation_chunks():
+        yield first_chunk
+        async for chunk in stream:
+            yield chunk
+
+    return StreamingResponse(translation_chunks(), media_type="text/plain; charset=utf-8")
+
+
+@router.post("/translate-batch", response_model=ApiResponse, status_code=status.HTTP_200_OK)
+async def translate_texts_batch(
+    request: BatchTranslationRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    translation_service: TranslationService = Depends(get_translation_service)
+):
+    """
+    Translate several texts in a single OpenAI request
+
+    Intended for translating all text boxes of a page at once. Translations are
+    returned in the same order as the source texts.
+    """
+    try:
+        # Validate input
+        if not request.source_texts or any(not text for text in request.source_texts):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Source texts cannot be empty"
+            )
+
+        # Perform batch translation
+        result = await translation_service.translate_batch(
+            source_texts=request.source_texts,
+            target_language=request.target_language,
+            context=request.context
+        )
+
+        return ApiResponse(
+            success=True,
+            message=f"Translated {len(result['translated_texts'])} texts successfully",
+            data=BatchTranslationResponse(**result)
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Batch translation endpoint error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Batch translation failed: {str(e)}"
+        )
+
+
 @router.post("/translate-enhanced", response_model=ApiResponse, status_code=status.HTTP_200_OK)
 async def translate_text_enhanced(
     request: EnhancedTranslationRequest,
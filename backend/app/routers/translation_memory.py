@@ -287,7 +287,7 @@ async def increment_tm_usage(
 
 @router.get("/series/{series_id}/search", response_model=List[TranslationMemoryResponse])
 async def search_tm_entries(
-    series_id: int = Path(..., description="The ID of the series"),
+    series_id: str = Path(..., description="The ID of the series"),
     q: str = Query(..., description="Search query"),
     limit: int = Query(10, ge=1, le=100, description="Maximum number of results"),
     current_user: Dict[str, Any] = Depends(get_current_user),
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from typing import List, Dict, Any
 from supabase import Client
 from pydantic import ValidationError
@@ -99,6 +99,7 @@ async def create_user(
 
 @router.get("/", response_model=List[UserResponse])
 async def get_users(
+    response: Response,
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
     current_user: Dict[str, Any] = Depends(get_current_user),
@@ -106,9 +107,12 @@ async def get_users(
 ):
     """
     Get all users with pagination.
+    The total number of users is returned in the X-Total-Count header.
     Requires authentication.
     """
-    return await user_service.get_all_users(limit=limit, offset=offset)
+    users_page = await user_service.get_all_users(limit=limit, offset=offset)
+    response.headers["X-Total-Count"] = str(users_page["total"])
+    return users_page["items"]
 
 
 @router.get("/me", response_model=UserResponse)
@@ -1,17 +1,32 @@
+from cachetools import TTLCache
 from supabase import Client
 from app.models import (
     DashboardResponse
 )
 
 
+# The single dashboard row as served to dashboard page reads. Cleared by every update made
+# through DashboardService; changes from other processes show up after the TTL.
+_dashboard_cache: TTLCache = TTLCache(maxsize=1, ttl=30)
+
+
 class DashboardService:
     """Service for dashboard-related operations"""
     
     def __init__(self, supabase: Client):
         self.supabase = supabase
     
-    async def get_dashboard_stats(self) -> DashboardResponse:
-        """Get overall dashboard statistics from dashboard table"""
+    async def get_dashboard_stats(self, use_cache: bool = False) -> DashboardResponse:
+        """
+        Get overall dashboard statistics from dashboard table
+
+        Read-modify-write callers must leave use_cache off so they start from the stored counts.
+        """
+        if use_cache:
+            cached_stats = _dashboard_cache.get("stats")
+            if cached_stats is not None:
+                return cached_stats
+
         try:
             # Get dashboard data from the dashboard table (single query)
             dashboard_response = (
@@ -35,13 +50,16 @@ class DashboardService:
 
             dashboard_data = dashboard_response.data[0]
 
-            return DashboardResponse(
+            stats = DashboardResponse(
                 total_series=dashboard_data.get("total_series", 0),
                 progress_chapters=dashboard_data.get("progress_chapters", 0),
                 processed_pages=dashboard_data.get("processed_pages", 0),
                 translated_textbox=dashboard_data.get("translated_textbox", 0),
                 recent_activities=dashboard_data.get("recent_activities", [])
             )
+            _dashboard_cache["stats"] = stats
+
+            return stats
             
         except Exception as e:
             print(f"❌ Error fetching dashboard statistics: {str(e)}")
@@ -69,7 +87,7 @@ class DashboardService:
                 "processed_pages": pages_count,
                 "translated_textbox": textbox_count,
                 "recent_activities": []
-            }).execute()
+            }, returning="minimal").execute()
             
         except Exception as e:
             print(f"❌ Error initializing dashboard record: {str(e)}")
@@ -95,7 +113,8 @@ class DashboardService:
                 return
             
             # Update dashboard record
-            self.supabase.table("dashboard").update(update_data).eq("id", 1).execute()
+            self.supabase.table("dashboard").update(update_data, returning="minimal").eq("id", 1).execute()
+            _dashboard_cache.clear()
             
         except Exception as e:
             print(f"❌ Error updating dashboard statistics: {str(e)}")
@@ -211,7 +230,7 @@ class DashboardService:
         """Get complete dashboard data"""
         try:
             # Only fetch dashboard stats since that's all we need now
-            return await self.get_dashboard_stats()
+            return await self.get_dashboard_stats(use_cache=True)
             
         except Exception as e:
             print(f"❌ Error fetching complete dashboard data: {str(e)}")
@@ -0,0 +1,107 @@
+from typing import Dict, Tuple
+import numpy as np
+# Optional JIT compilation of the 64-bit kernel - falls back to Python integers
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Longest pattern the machine-word kernel handles; longer ones use Python integers
+_WORD_SIZE = 64
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _lcs_length_64(pattern_masks: np.ndarray, text_indices: np.ndarray, pattern_length: int) -> int:
+        """Bit-parallel LCS length for a pattern of at most 64 characters"""
+        full = np.uint64(0xFFFFFFFFFFFFFFFF) >> np.uint64(_WORD_SIZE - pattern_length)
+        s = full
+        for i in range(text_indices.shape[0]):
+            index = text_indices[i]
+            if index < 0:
+                continue
+            u = s & pattern_masks[index]
+            s = ((s + u) | (s - u)) & full
+
+        remaining = ~s & full
+        count = 0
+        while remaining:
+            remaining &= remaining - np.uint64(1)
+            count += 1
+        return count
+
+
+def _pattern_masks(pattern: str) -> Dict[str, int]:
+    """Bitmask of the positions of each character in pattern"""
+    masks: Dict[str, int] = {}
+    for position, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << position)
+    return masks
+
+
+def _strip_common_affix(text1: str, text2: str) -> Tuple[int, str, str]:
+    """Remove the common prefix and suffix of two strings, returning their total length"""
+    max_length = min(len(text1), len(text2))
+
+    prefix = 0
+    while prefix < max_length and text1[prefix] == text2[prefix]:
+        prefix += 1
+
+    suffix = 0
+    while suffix < max_length - prefix and text1[-1 - suffix] == text2[-1 - suffix]:
+        suffix += 1
+
+    return (
+        prefix + suffix,
+        text1[prefix:len(text1) - suffix],
+        text2[prefix:len(text2) - suffix]
+    )
+
+
+def lcs_length(text1: str, text2: str) -> int:
+    """
+    Length of the longest common subsequence of two strings
+
+    Uses the bit-parallel algorithm of Allison-Dix/Hyyrö: one word operation per
+    character of the longer string, with the shorter string packed into a bitmask.
+    """
+    if text1 == text2:
+        return len(text1)
+
+    # A common prefix and suffix are always part of the LCS; only the middles need the DP
+    affix_length, text1, text2 = _strip_common_affix(text1, text2)
+
+    pattern, text = (text1, text2) if len(text1) <= len(text2) else (text2, text1)
+    if not pattern:
+        return affix_length
+
+    masks = _pattern_masks(pattern)
+
+    if NUMBA_AVAILABLE and len(pattern) <= _WORD_SIZE:
+        chars = list(masks)
+        char_indices = {char: index for index, char in enumerate(chars)}
+        pattern_masks = np.array([masks[char] for char in chars], dtype=np.uint64)
+        text_indices = np.fromiter((char_indices.get(char, -1) for char in text), dtype=np.int64, count=len(text))
+        return affix_length + int(_lcs_length_64(pattern_masks, text_indices, len(pattern)))
+
+    full = (1 << len(pattern)) - 1
+    s = full
+    for char in text:
+        u = s & masks.get(char, 0)
+        s = ((s + u) | (s - u)) & full
+    return affix_length + bin(~s & full).count("1")
+
+
+def indel_similarity(text1: str, text2: str) -> float:
+    """
+    Normalized Indel similarity 2*LCS/(len1+len2) between two strings (0.0 to 1.0)
+
+    This is the ratio difflib.SequenceMatcher approximates and rapidfuzz's fuzz.ratio
+    computes exactly.
+    """
+    total_length = len(text1) + len(text2)
+    if not total_length:
+        return 1.0
+    return 2 * lcs_length(text1, text2) / total_length
@@ -1,7 +1,6 @@
 import base64
 import io
 import time
-import easyocr
 import cv2
 import numpy as np
 from PIL import Image
@@ -21,6 +20,12 @@ except AttributeError:
     ANTIALIAS = Image.ANTIALIAS
 
 
+def _create_reader(languages: list) -> 'easyocr.Reader':
+    """Create an EasyOCR reader; easyocr and torch are only imported once OCR is first used"""
+    import easyocr
+    return easyocr.Reader(languages, gpu=False, verbose=False)
+
+
 class OCRService:
     def __init__(self):
         self._fix_pil_compatibility()
@@ -86,7 +91,7 @@ class OCRService:
 
         for i, lang_combo in enumerate(compatible_combinations):
             try:
-                self.reader = easyocr.Reader(lang_combo, gpu=False, verbose=False)
+                self.reader = _create_reader(lang_combo)
                 self.ocr_languages = lang_combo
                 return
 
@@ -106,7 +111,7 @@ class OCRService:
             if 'en' not in target_languages:
                 target_languages = target_languages + ['en']
 
-            reader = easyocr.Reader(target_languages, gpu=False, verbose=False)
+            reader = _create_reader(target_languages)
             self.specialized_readers[cache_key] = reader
 
             return reader
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from datetime import datetime, timezone
 from supabase import Client
 import os
@@ -7,7 +7,8 @@ from app.models import (
     TextBoxResponse,
     TextBoxCreate,
     TextBoxUpdate,
-    TextRegionDetectionResponse
+    TextRegionDetectionResponse,
+    TranslationMemoryResponse
 )
 from app.services.tm_calculation_service import TMCalculationService
 from app.services.translation_memory_service import TranslationMemoryService
@@ -104,11 +105,8 @@ class TextBoxService:
             if not response.data:
                 return []
             
-            text_boxes = []
-            for text_box_data in response.data:
-                text_boxes.append(TextBoxResponse(**text_box_data))
-            
-            return text_boxes
+            # Rows come straight from the text_boxes table, so skip re-validation
+            return [TextBoxResponse.model_construct(**text_box_data) for text_box_data in response.data]
             
         except Exception as e:
             print(f"❌ Error fetching text boxes for page {page_id}: {str(e)}")
@@ -177,15 +175,15 @@ class TextBoxService:
     async def delete_text_box(self, text_box_id: str) -> bool:
         """Delete a text box"""
         try:
-            # Delete from database
+            # Delete from database - only the affected row count is needed, not the deleted row
             response = (
                 self.supabase.table(self.table_name)
-                .delete()
+                .delete(count="exact", returning="minimal")
                 .eq("id", text_box_id)
                 .execute()
             )
-            
-            if not response.data:
+
+            if not response.count:
                 print(f"❌ Text box with ID {text_box_id} not found for deletion")
                 return False
             
@@ -195,39 +193,69 @@ class TextBoxService:
             print(f"❌ Error deleting text box {text_box_id}: {str(e)}")
             raise Exception(f"Failed to delete text box: {str(e)}")
     
-    async def get_text_boxes_by_chapter(self, chapter_id: str, skip: int = 0, limit: int = 1000) -> List[TextBoxResponse]:
-        """Get all text boxes for a specific chapter (across all pages)"""
-        try:
-            # First get all pages for the chapter
-            pages_response = (
-                self.supabase.table("pages")
-                .select("id")
-                .eq("chapter_id", chapter_id)
-                .execute()
-            )
-            
-            if not pages_response.data:
-                return []
-            
-            page_ids = [page["id"] for page in pages_response.data]
-            
-            # Then get all text boxes for those pages
+    async def iter_text_boxes_by_chapter(
+        self,
+        chapter_id: str,
+        batch_size: int = 500,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[List[TextBoxResponse]]:
+        """
+        Iterate over the text boxes of a chapter (across all pages) in batches
+
+        Pages are joined in the same query with pages!inner, and rows are read
+        with successive ranges until a short batch is returned, so chapters of
+        any size are fetched without one huge query.
+
+        Args:
+            chapter_id: ID of the chapter
+            batch_size: Number of text boxes fetched per query
+            skip: Number of text boxes to skip
+            limit: Maximum number of text boxes to return (None for all)
+
+        Yields:
+            Lists of at most batch_size text boxes
+        """
+        offset = skip
+        remaining = limit
+
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+
             response = (
                 self.supabase.table(self.table_name)
-                .select("*")
-                .in_("page_id", page_ids)
+                .select("*, pages!inner(chapter_id)")
+                .eq("pages.chapter_id", chapter_id)
                 .order("created_at", desc=False)
-                .range(skip, skip + limit - 1)
+                .order("id", desc=False)
+                .range(offset, offset + size - 1)
                 .execute()
             )
-            
-            if not response.data:
-                return []
-            
+
+            rows = response.data or []
+            batch = []
+            for text_box_data in rows:
+                text_box_data.pop("pages", None)
+                # Rows come straight from the text_boxes table, so skip re-validation
+                batch.append(TextBoxResponse.model_construct(**text_box_data))
+
+            if batch:
+                yield batch
+
+            if len(rows) < size:
+                return
+
+            offset += size
+            if remaining is not None:
+                remaining -= size
+
+    async def get_text_boxes_by_chapter(self, chapter_id: str, skip: int = 0, limit: int = 1000) -> List[TextBoxResponse]:
+        """Get all text boxes for a specific chapter (across all pages)"""
+        try:
             text_boxes = []
-            for text_box_data in response.data:
-                text_boxes.append(TextBoxResponse(**text_box_data))
-            
+            async for batch in self.iter_text_boxes_by_chapter(chapter_id, skip=skip, limit=limit):
+                text_boxes.extend(batch)
+
             return text_boxes
 
         except Exception as e:
@@ -237,24 +265,12 @@ class TextBoxService:
     async def get_text_boxes_count_by_chapter(self, chapter_id: str) -> int:
         """Get total count of text boxes for a specific chapter"""
         try:
-            # First get all pages for the chapter
-            pages_response = (
-                self.supabase.table("pages")
-                .select("id")
-                .eq("chapter_id", chapter_id)
-                .execute()
-            )
-
-            if not pages_response.data:
-                return 0
-
-            page_ids = [page["id"] for page in pages_response.data]
-
-            # Count text boxes for those pages
+            # Count text boxes of the chapter's pages in a single joined query
             response = (
                 self.supabase.table(self.table_name)
-                .select("id", count="exact")
-                .in_("page_id", page_ids)
+                .select("id, pages!inner(chapter_id)", count="exact")
+                .eq("pages.chapter_id", chapter_id)
+                .limit(1)
                 .execute()
             )
 
@@ -294,7 +310,13 @@ class TextBoxService:
 
             created_text_boxes = []
 
-            for region in detection_result.text_regions:
+            # Score all regions against the translation memory in one batch
+            tm_scores = await self._calculate_tm_scores_for_page(
+                page_id,
+                [region.text for region in detection_result.text_regions]
+            )
+
+            for region, tm_score in zip(detection_result.text_regions, tm_scores):
                 try:
                     # Create text box data
                     text_box_data = TextBoxCreate(
@@ -305,7 +327,7 @@ class TextBoxService:
                         w=region.width,
                         h=region.height,
                         ocr=region.text,
-                        tm=None  # Let create_text_box calculate proper TM score from translation memory
+                        tm=tm_score
                     )
 
                     # Create the text box
@@ -323,6 +345,22 @@ class TextBoxService:
             print(f"❌ Error creating text boxes from detection for page {page_id}: {str(e)}")
             return []
 
+    async def _calculate_tm_scores_for_page(self, page_id: str, ocr_texts: List[str]) -> List[float]:
+        """Calculate the TM score of each OCR text on a page, defaulting to 0.0"""
+        try:
+            series_id = await self._get_series_id_from_page(page_id)
+            if not series_id:
+                print(f"⚠️ Could not get series_id for page - setting TM to 0")
+                return [0.0] * len(ocr_texts)
+
+            results = await self.tm_service.calculate_tm_scores_batch(ocr_texts, series_id)
+            print(f"📊 Calculated TM scores for {len(ocr_texts)} text regions on page {page_id}")
+            return [tm_score for tm_score, _ in results]
+
+        except Exception as tm_error:
+            print(f"⚠️ TM calculation failed: {str(tm_error)} - setting TM to 0")
+            return [0.0] * len(ocr_texts)
+
     async def _get_page_image_url(self, page_id: str) -> str:
         """Get the page image URL from the page data"""
         try:
@@ -458,24 +496,49 @@ class TextBoxService:
                 original_text_box.corrected.strip() == updated_text_box.corrected.strip()):
                 return  # No change in corrected text, don't create duplicate TM entry
 
-            # Get series_id
-            series_id = await self._get_series_id_from_page(updated_text_box.page_id)
-            if not series_id:
+            source_text = updated_text_box.ocr.strip()
+            target_text = updated_text_box.corrected.strip()
+            context = updated_text_box.reason or "Auto-created from text box save"
+
+            # Create TM entry - the series is resolved and the row inserted in one database call
+            try:
+                tm_entry = await self.tm_memory_service.create_tm_entry_for_text_box(
+                    updated_text_box.id, source_text, target_text, context
+                )
+            except Exception as rpc_error:
+                print(f"⚠️ create_tm_for_text_box unavailable, resolving series separately: {str(rpc_error)}")
+                tm_entry = await self._create_tm_entry_via_series_lookup(
+                    updated_text_box, source_text, target_text, context
+                )
+
+            if not tm_entry:
                 print(f"⚠️ Could not get series_id for text box {updated_text_box.id}, skipping TM creation")
                 return
 
-            # Create TM entry
-            from app.models import TranslationMemoryCreate
-            tm_data = TranslationMemoryCreate(
-                series_id=series_id,
-                source_text=updated_text_box.ocr.strip(),
-                target_text=updated_text_box.corrected.strip(),
-                context=updated_text_box.reason or "Auto-created from text box save"
-            )
-
-            tm_entry = await self.tm_memory_service.create_tm_entry(tm_data)
             print(f"✅ Created TM entry: '{tm_entry.source_text}' -> '{tm_entry.target_text}'")
 
         except Exception as e:
             print(f"⚠️ Failed to create TM entry for text box {updated_text_box.id}: {str(e)}")
             # Don't raise exception - TM creation failure shouldn't break text box update
+
+    async def _create_tm_entry_via_series_lookup(
+        self,
+        text_box: TextBoxResponse,
+        source_text: str,
+        target_text: str,
+        context: str
+    ) -> Optional[TranslationMemoryResponse]:
+        """Create TM entry by looking up the series first (used when the database function is missing)"""
+        series_id = await self._get_series_id_from_page(text_box.page_id)
+        if not series_id:
+            return None
+
+        from app.models import TranslationMemoryCreate
+        tm_data = TranslationMemoryCreate(
+            series_id=series_id,
+            source_text=source_text,
+            target_text=target_text,
+            context=context
+        )
+
+        return await self.tm_memory_service.create_tm_entry(tm_data)
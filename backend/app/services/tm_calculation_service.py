@@ -1,9 +1,133 @@
-from typing import List, Optional, Tuple
-import difflib
+import asyncio
+import bisect
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+import logging
 import re
+import numpy as np
 from supabase import Client
 from app.services.translation_memory_service import TranslationMemoryService
+from app.services.tm_embedding_index import embedding_index_enabled, search_tm_embedding_candidates
+from app.services.lcs_similarity import indel_similarity
 from app.models import TranslationMemoryResponse
+# Optional C++ string matching - falls back to the bit-parallel LCS in lcs_similarity
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    print("Warning: rapidfuzz not available. TM similarity will use the built-in LCS ratio.")
+
+
+logger = logging.getLogger(__name__)
+
+# Number of trigram-ranked candidates fetched from the database per OCR text
+TM_CANDIDATE_LIMIT = 20
+
+# Scoring at least this many text/entry pairs (full scans, page batches) runs in a worker thread
+TM_SCORING_THREAD_MIN_PAIRS = 200
+
+# Number of embedding-ranked candidates added when the TM embedding index is enabled
+TM_EMBEDDING_CANDIDATE_LIMIT = 32
+
+
+# Lower score bounds of each TM quality label and color, in ascending order
+_QUALITY_LABEL_BOUNDS = (0.20, 0.40, 0.60, 0.75, 0.85, 0.95)
+_QUALITY_LABELS = ("No Match", "Weak Match", "Partial Match", "Fair Match", "Good Match", "Excellent Match", "Perfect Match")
+_QUALITY_COLOR_BOUNDS = (0.40, 0.60, 0.75, 0.85, 0.95)
+_QUALITY_COLORS = ("gray", "red", "orange", "yellow", "blue", "green")
+
+# Whitespace runs and punctuation removed by TMCalculationService._normalize_text
+_WS_RE = re.compile(r'\s+')
+_PUNCT_RE = re.compile(r'[^\w\s가-힣ㄱ-ㅎㅏ-ㅣ一-龯ひらがなカタカナ]')
+
+# str.translate table deleting the ASCII characters _PUNCT_RE removes, for ASCII-only text
+_ASCII_PUNCT_TABLE = str.maketrans(
+    '', '', ''.join(char for char in map(chr, range(128)) if _PUNCT_RE.match(char))
+)
+
+# Normalized TM source texts by entry ID as (source_text, normalized_text). Kept at
+# module level because the service is created per request; an entry is normalized
+# again only when its source text changes.
+_NORM_SOURCE_CACHE: Dict[str, Tuple[str, str]] = {}
+_NORM_SOURCE_CACHE_MAX_SIZE = 50000
+
+
+# Width of the hashed word bitset used to detect word-disjoint texts cheaply
+_WORD_BITS_WIDTH = 128
+
+
+@lru_cache(maxsize=4096)
+def _split_words(text: str) -> Tuple[FrozenSet[str], int]:
+    """
+    Split normalized text into a word set, cached so TM sources are split once
+
+    Also returns a bitset with one bit per hashed word. Texts that share a word
+    always share a bit, so a zero AND of two bitsets proves the texts have no
+    words in common without building a set intersection.
+    """
+    words = frozenset(text.split())
+    bits = 0
+    for word in words:
+        bits |= 1 << (hash(word) % _WORD_BITS_WIDTH)
+    return words, bits
+
+
+def _sequence_similarity(text1: str, text2: str) -> float:
+    """Character-level similarity ratio between two normalized texts (0.0 to 1.0)"""
+    if RAPIDFUZZ_AVAILABLE:
+        # Bit-parallel Indel similarity, the same 2*M/T ratio difflib approximates
+        return fuzz.ratio(text1, text2) / 100.0
+    return indel_similarity(text1, text2)
+
+
+def _token_set_similarity(text1: str, text2: str) -> float:
+    """
+    Token-set similarity between two normalized texts (0.0 to 1.0)
+
+    Compares the sorted unique words, scoring 1.0 when the words of one text are a
+    subset of the other's.
+    """
+    if RAPIDFUZZ_AVAILABLE:
+        return fuzz.token_set_ratio(text1, text2) / 100.0
+
+    words1, _ = _split_words(text1)
+    words2, _ = _split_words(text2)
+    if not words1 or not words2:
+        return 0.0
+
+    common = words1 & words2
+    if common and (common == words1 or common == words2):
+        return 1.0
+
+    sect = " ".join(sorted(common))
+    combined1 = " ".join(filter(None, (sect, " ".join(sorted(words1 - common)))))
+    combined2 = " ".join(filter(None, (sect, " ".join(sorted(words2 - common)))))
+    ratio = indel_similarity(combined1, combined2)
+    if sect:
+        ratio = max(ratio, indel_similarity(sect, combined1), indel_similarity(sect, combined2))
+    return ratio
+
+
+def _batch_ratios(queries: List[str], choices: List[str]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Sequence and token-set similarity matrices of every query against every choice
+
+    With rapidfuzz each matrix is computed in one C call across worker threads.
+    Without it, None is returned and the ratios are computed lazily per pair.
+    """
+    if RAPIDFUZZ_AVAILABLE and queries and choices:
+        sequence_matrix = process.cdist(queries, choices, scorer=fuzz.ratio, workers=-1) / 100.0
+        token_set_matrix = process.cdist(queries, choices, scorer=fuzz.token_set_ratio, workers=-1) / 100.0
+        return sequence_matrix, token_set_matrix
+    return None
+
+
+def _length_ratio_bound(len1: int, len2: int) -> float:
+    """Upper bound of the Indel similarity ratio of two strings with these lengths"""
+    if not len1 + len2:
+        return 0.0
+    return 2 * min(len1, len2) / (len1 + len2)
 
 
 class TMCalculationService:
@@ -28,26 +152,46 @@ class TMCalculationService:
             return 0.0
 
         # Normalize texts for comparison
-        norm_text1 = self._normalize_text(text1)
-        norm_text2 = self._normalize_text(text2)
+        return self.calculate_similarity_prenormalized(
+            self._normalize_text(text1),
+            self._normalize_text(text2)
+        )
 
+    def calculate_similarity_prenormalized(
+        self,
+        norm_text1: str,
+        norm_text2: str,
+        ratios: Optional[Tuple[float, float]] = None
+    ) -> float:
+        """
+        Calculate similarity between two texts already passed through _normalize_text
+
+        Args:
+            norm_text1: Normalized OCR text
+            norm_text2: Normalized TM source text
+            ratios: Precomputed (sequence, token_set) similarities, if already batch-scored
+
+        Returns:
+            Similarity score between 0.0 and 1.0
+        """
         # Exact match after normalization
         if norm_text1 == norm_text2:
             return 1.0
 
         # Check for exact word matches (case-insensitive)
-        word_match_score = self._calculate_word_match_score(norm_text1, norm_text2)
+        word_match_score = self._calculate_word_match_score(self._token_overlap(norm_text1, norm_text2))
         if word_match_score >= 0.9:  # If we have a very high word match, return it
             return word_match_score
 
         # Check if shorter text is contained in longer text (substring matching)
         substring_score = self._calculate_substring_score(norm_text1, norm_text2)
 
-        # Use difflib's SequenceMatcher for similarity calculation
-        sequence_similarity = difflib.SequenceMatcher(None, norm_text1, norm_text2).ratio()
-
-        # Apply fuzzy matching bonus for partial matches
-        fuzzy_bonus = self._calculate_fuzzy_bonus(norm_text1, norm_text2)
+        # Character-level sequence similarity and token-set similarity for partial matches
+        if ratios is None:
+            sequence_similarity = _sequence_similarity(norm_text1, norm_text2)
+            fuzzy_bonus = _token_set_similarity(norm_text1, norm_text2)
+        else:
+            sequence_similarity, fuzzy_bonus = ratios
 
         # Combine all scores with weights
         # Prioritize word matches and substring matches over sequence similarity
@@ -58,8 +202,11 @@ class TMCalculationService:
         )
 
         # Debug logging for similarity calculation
-        if word_match_score > 0 or substring_score > 0 or sequence_similarity > 0.1:
-            print(f"  📊 Similarity breakdown: word={word_match_score:.3f}, substring={substring_score:.3f}, sequence={sequence_similarity:.3f}, fuzzy={fuzzy_bonus:.3f} -> final={final_score:.3f}")
+        if logger.isEnabledFor(logging.DEBUG) and (word_match_score > 0 or substring_score > 0 or sequence_similarity > 0.1):
+            logger.debug(
+                "  📊 Similarity breakdown: word=%.3f, substring=%.3f, sequence=%.3f, fuzzy=%.3f -> final=%.3f",
+                word_match_score, substring_score, sequence_similarity, fuzzy_bonus, final_score
+            )
 
         return min(final_score, 1.0)
     
@@ -72,39 +219,59 @@ class TMCalculationService:
         text = text.lower()
         
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
         
         # Remove common punctuation but keep essential characters
-        text = re.sub(r'[^\w\s가-힣ㄱ-ㅎㅏ-ㅣ一-龯ひらがなカタカナ]', '', text)
+        if text.isascii():
+            text = text.translate(_ASCII_PUNCT_TABLE)
+        else:
+            text = _PUNCT_RE.sub('', text)
         
         return text.strip()
 
-    def _calculate_word_match_score(self, text1: str, text2: str) -> float:
+    def _normalized_source(self, tm_entry: TranslationMemoryResponse) -> str:
+        """Get the normalized source text of a TM entry, normalizing it again only after an edit"""
+        cached = _NORM_SOURCE_CACHE.get(tm_entry.id)
+        if cached is not None and cached[0] == tm_entry.source_text:
+            return cached[1]
+
+        norm_source = self._normalize_text(tm_entry.source_text)
+        if len(_NORM_SOURCE_CACHE) >= _NORM_SOURCE_CACHE_MAX_SIZE:
+            _NORM_SOURCE_CACHE.clear()
+        _NORM_SOURCE_CACHE[tm_entry.id] = (tm_entry.source_text, norm_source)
+        return norm_source
+
+    def _token_overlap(self, text1: str, text2: str) -> Tuple[int, int, int, int]:
+        """
+        Calculate word overlap between two normalized texts in a single pass
+
+        Returns:
+            Tuple of (common_words, total_unique_words, len_words1, len_words2)
+        """
+        words1, bits1 = _split_words(text1)
+        words2, bits2 = _split_words(text2)
+
+        # Disjoint bitsets mean no common words - skip the set intersection
+        common = len(words1 & words2) if bits1 & bits2 else 0
+        return common, len(words1) + len(words2) - common, len(words1), len(words2)
+
+    def _calculate_word_match_score(self, overlap: Tuple[int, int, int, int]) -> float:
         """
         Calculate similarity based on exact word matches
         Handles cases like "AIR" matching "air" perfectly
         """
-        words1 = set(text1.split())
-        words2 = set(text2.split())
-
-        if not words1 or not words2:
-            return 0.0
+        common, total_unique_words, len_words1, len_words2 = overlap
 
         # Check for exact word matches
-        common_words = words1.intersection(words2)
-
-        if not common_words:
+        if not common:
             return 0.0
 
         # If one text is a single word and it matches a word in the other text
-        if len(words2) == 1 and words2.issubset(words1):
-            return 1.0  # Perfect match for single word
-        elif len(words1) == 1 and words1.issubset(words2):
+        if len_words1 == 1 or len_words2 == 1:
             return 1.0  # Perfect match for single word
 
         # Calculate score based on word overlap
-        total_unique_words = len(words1.union(words2))
-        return len(common_words) / total_unique_words
+        return common / total_unique_words
 
     def _calculate_substring_score(self, text1: str, text2: str) -> float:
         """
@@ -120,25 +287,122 @@ class TMCalculationService:
 
         return 0.0
 
-    def _calculate_fuzzy_bonus(self, text1: str, text2: str) -> float:
+    def _may_reach_threshold(self, norm_text1: str, norm_text2: str, threshold: float) -> bool:
         """
-        Calculate fuzzy matching bonus for partial word matches
+        Cheap upper-bound check on whether a pair can score at least threshold
+
+        Pairs that may share a word are always scored. Otherwise the word score is
+        zero, the substring score is at most shorter/longer, and the sequence and
+        token-set ratios are bounded by the lengths of the texts and of their
+        joined unique words respectively.
         """
-        words1 = set(text1.split())
-        words2 = set(text2.split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        # Calculate word overlap
-        common_words = words1.intersection(words2)
-        total_words = words1.union(words2)
-        
-        if not total_words:
-            return 0.0
-        
-        return len(common_words) / len(total_words)
-    
+        words1, bits1 = _split_words(norm_text1)
+        words2, bits2 = _split_words(norm_text2)
+        if threshold <= 0.0 or bits1 & bits2:
+            return True
+
+        shorter, longer = sorted((len(norm_text1), len(norm_text2)))
+        if not longer:
+            return True
+
+        words_length1 = sum(map(len, words1)) + max(len(words1) - 1, 0)
+        words_length2 = sum(map(len, words2)) + max(len(words2) - 1, 0)
+        blended_bound = (
+            _length_ratio_bound(shorter, longer) * 0.6
+            + _length_ratio_bound(words_length1, words_length2) * 0.4
+        )
+        return max(shorter / longer, blended_bound) >= threshold
+
+    def _score_matrix(
+        self,
+        norm_ocr_texts: List[str],
+        tm_entries: List[TranslationMemoryResponse],
+        threshold: float = 0.0
+    ) -> np.ndarray:
+        """
+        Score normalized OCR texts against each TM entry's source text
+
+        Returns a matrix with one row per OCR text and one column per entry. Pairs
+        whose length rules out reaching threshold are left at 0.0. Sequence and
+        token-set ratios are batch-computed; word and substring scores are then
+        combined per pair as usual.
+        """
+        norm_sources = [self._normalized_source(tm_entry) for tm_entry in tm_entries]
+        scores = np.zeros((len(norm_ocr_texts), len(norm_sources)), dtype=np.float64)
+        batch_ratios = _batch_ratios(norm_ocr_texts, norm_sources)
+
+        for row, norm_ocr_text in enumerate(norm_ocr_texts):
+            if batch_ratios is not None:
+                sequence_row = batch_ratios[0][row].tolist()
+                token_set_row = batch_ratios[1][row].tolist()
+
+            for column, norm_source in enumerate(norm_sources):
+                if not self._may_reach_threshold(norm_ocr_text, norm_source, threshold):
+                    continue
+                ratios = (sequence_row[column], token_set_row[column]) if batch_ratios is not None else None
+                scores[row, column] = self.calculate_similarity_prenormalized(norm_ocr_text, norm_source, ratios)
+
+        return scores
+
+    async def _score_matrix_off_loop(
+        self,
+        norm_ocr_texts: List[str],
+        tm_entries: List[TranslationMemoryResponse],
+        threshold: float
+    ) -> np.ndarray:
+        """
+        Score OCR texts against TM entries, moving large batches to a worker thread
+
+        rapidfuzz releases the GIL inside cdist, and the pure-Python fallback no longer
+        blocks other requests on the event loop while a whole series is scored.
+        """
+        if len(norm_ocr_texts) * len(tm_entries) < TM_SCORING_THREAD_MIN_PAIRS:
+            return self._score_matrix(norm_ocr_texts, tm_entries, threshold)
+        return await asyncio.to_thread(self._score_matrix, norm_ocr_texts, tm_entries, threshold)
+
+    async def _get_candidate_entries(
+        self,
+        ocr_texts: List[str],
+        series_id: str,
+        threshold: float
+    ) -> List[TranslationMemoryResponse]:
+        """
+        Get TM entries worth scoring for one or more OCR texts
+
+        Candidates are pre-filtered in the database with pg_trgm so only the top
+        matches of each text are scored in Python; the trigram cutoff is lowered to
+        threshold so weak matches the scorer accepts are kept. Falls back to scanning
+        every TM entry of the series if the candidate functions are not available. When
+        the embedding index is enabled, semantically close entries are added as well.
+        """
+        try:
+            if len(ocr_texts) == 1:
+                candidates = await self.tm_service.get_tm_candidates(
+                    series_id, ocr_texts[0], TM_CANDIDATE_LIMIT, threshold
+                )
+            else:
+                candidates = await self.tm_service.get_tm_candidates_batch(
+                    series_id, ocr_texts, TM_CANDIDATE_LIMIT, threshold
+                )
+        except Exception as e:
+            logger.warning("⚠️ TM candidate lookup failed, scanning all TM entries: %s", e)
+            return await self.tm_service.get_all_tm_entries_for_analysis(series_id)
+
+        if embedding_index_enabled():
+            try:
+                seen_ids = {tm_entry.id for tm_entry in candidates}
+                for ocr_text in ocr_texts:
+                    for tm_entry in await search_tm_embedding_candidates(
+                        self.tm_service, series_id, ocr_text, TM_EMBEDDING_CANDIDATE_LIMIT
+                    ):
+                        if tm_entry.id not in seen_ids:
+                            seen_ids.add(tm_entry.id)
+                            candidates.append(tm_entry)
+            except Exception as e:
+                logger.warning("⚠️ TM embedding lookup failed, using trigram candidates only: %s", e)
+
+        return candidates
+
     async def calculate_tm_score(
         self,
         ocr_text: str,
@@ -160,40 +424,93 @@ class TMCalculationService:
             if not ocr_text or not ocr_text.strip():
                 return 0.0, None
             
-            # Get all TM entries for the series
-            tm_entries = await self.tm_service.get_all_tm_entries_for_analysis(series_id)
+            # Get the most plausible TM entries for the series that have source text to match
+            tm_entries = [
+                tm_entry for tm_entry in await self._get_candidate_entries([ocr_text], series_id, threshold)
+                if tm_entry.source_text
+            ]
             
             if not tm_entries:
                 return 0.0, None
             
-            best_score = 0.0
-            best_match = None
-            
-            # Compare OCR text with each TM entry's source text
-            for tm_entry in tm_entries:
-                if not tm_entry.source_text:
-                    continue
+            # Score every entry in one batch
+            scores = (await self._score_matrix_off_loop([self._normalize_text(ocr_text)], tm_entries, threshold))[0]
 
-                # Calculate similarity with source text
-                similarity = self.calculate_similarity(ocr_text, tm_entry.source_text)
+            # Debug logging for TM calculation
+            if logger.isEnabledFor(logging.DEBUG):
+                for tm_entry, similarity in zip(tm_entries, scores):
+                    logger.debug("🔍 TM Debug: OCR='%s' vs TM='%s' -> Score: %.3f", ocr_text, tm_entry.source_text, similarity)
 
-                # Debug logging for TM calculation
-                print(f"🔍 TM Debug: OCR='{ocr_text}' vs TM='{tm_entry.source_text}' -> Score: {similarity:.3f}")
+            # Pick the best match (first one on ties)
+            best_index = int(np.argmax(scores))
+            best_score = float(scores[best_index])
+            best_match = tm_entries[best_index]
+            if best_score <= 0.0 or best_score < threshold:
+                best_score = 0.0
+                best_match = None
 
-                # Update best match if this is better
-                if similarity > best_score and similarity >= threshold:
-                    best_score = similarity
-                    best_match = tm_entry
-                    print(f"✅ New best match: {similarity:.3f} for '{tm_entry.source_text}'")
-
-            print(f"🎯 Final TM result: Best score = {best_score:.3f}, Threshold = {threshold}")
+            logger.debug("🎯 Final TM result: Best score = %.3f, Threshold = %s", best_score, threshold)
             
             return best_score, best_match
             
         except Exception as e:
-            print(f"❌ Error calculating TM score: {str(e)}")
+            logger.error("❌ Error calculating TM score: %s", e)
             return 0.0, None
     
+    async def calculate_tm_scores_batch(
+        self,
+        ocr_texts: List[str],
+        series_id: str,
+        threshold: float = 0.1
+    ) -> List[Tuple[float, Optional[TranslationMemoryResponse]]]:
+        """
+        Calculate TM scores for several OCR texts of the same series at once
+
+        Candidates for all texts are fetched in one query and scored as a single
+        matrix, so a page of text regions costs one round trip instead of one per region.
+
+        Args:
+            ocr_texts: The OCR texts to match against
+            series_id: The series ID to search TM entries for
+            threshold: Minimum similarity threshold
+
+        Returns:
+            List of (best_score, best_match_entry) tuples, one per OCR text
+        """
+        results: List[Tuple[float, Optional[TranslationMemoryResponse]]] = [(0.0, None)] * len(ocr_texts)
+        try:
+            indices = [index for index, ocr_text in enumerate(ocr_texts) if ocr_text and ocr_text.strip()]
+            if not indices:
+                return results
+            texts = [ocr_texts[index].strip() for index in indices]
+
+            # Get the most plausible TM entries for any of the texts that have source text to match
+            tm_entries = [
+                tm_entry for tm_entry in await self._get_candidate_entries(texts, series_id, threshold)
+                if tm_entry.source_text
+            ]
+
+            if not tm_entries:
+                return results
+
+            # Score every text against every entry in one batch
+            scores = await self._score_matrix_off_loop(
+                [self._normalize_text(text) for text in texts], tm_entries, threshold
+            )
+
+            # Pick the best match of each text (first one on ties)
+            best_columns = np.argmax(scores, axis=1)
+            for row, index in enumerate(indices):
+                best_score = float(scores[row, best_columns[row]])
+                if best_score > 0.0 and best_score >= threshold:
+                    results[index] = (best_score, tm_entries[best_columns[row]])
+
+            return results
+
+        except Exception as e:
+            logger.error("❌ Error calculating TM scores for %d texts: %s", len(ocr_texts), e)
+            return [(0.0, None)] * len(ocr_texts)
+
     async def calculate_tm_score_with_suggestions(
         self,
         ocr_text: str,
@@ -217,29 +534,22 @@ class TMCalculationService:
             if not ocr_text or not ocr_text.strip():
                 return 0.0, []
             
-            # Get all TM entries for the series
-            tm_entries = await self.tm_service.get_all_tm_entries_for_analysis(series_id)
+            # Get the most plausible TM entries for the series that have source text to match
+            tm_entries = [
+                tm_entry for tm_entry in await self._get_candidate_entries([ocr_text], series_id, threshold)
+                if tm_entry.source_text
+            ]
             
             if not tm_entries:
                 return 0.0, []
             
-            suggestions = []
-            
-            # Calculate similarity for each TM entry
-            for tm_entry in tm_entries:
-                if not tm_entry.source_text:
-                    continue
-                
-                similarity = self.calculate_similarity(ocr_text, tm_entry.source_text)
-                
-                if similarity >= threshold:
-                    suggestions.append((tm_entry, similarity))
-            
-            # Sort by similarity score (descending)
-            suggestions.sort(key=lambda x: x[1], reverse=True)
-            
-            # Limit to max_suggestions
-            suggestions = suggestions[:max_suggestions]
+            # Score every entry in one batch
+            scores = (await self._score_matrix_off_loop([self._normalize_text(ocr_text)], tm_entries, threshold))[0]
+
+            # Keep entries above the threshold, best first (stable for equal scores)
+            matching = np.flatnonzero(scores >= threshold)
+            ranked = matching[np.argsort(-scores[matching], kind="stable")][:max_suggestions]
+            suggestions = [(tm_entries[i], float(scores[i])) for i in ranked]
             
             # Get best score
             best_score = suggestions[0][1] if suggestions else 0.0
@@ -247,7 +557,7 @@ class TMCalculationService:
             return best_score, suggestions
             
         except Exception as e:
-            print(f"❌ Error calculating TM score with suggestions: {str(e)}")
+            logger.error("❌ Error calculating TM score with suggestions: %s", e)
             return 0.0, []
     
     def get_tm_quality_label(self, score: float) -> str:
@@ -260,20 +570,7 @@ class TMCalculationService:
         Returns:
             Quality label string
         """
-        if score >= 0.95:
-            return "Perfect Match"
-        elif score >= 0.85:
-            return "Excellent Match"
-        elif score >= 0.75:
-            return "Good Match"
-        elif score >= 0.60:
-            return "Fair Match"
-        elif score >= 0.40:
-            return "Partial Match"
-        elif score >= 0.20:
-            return "Weak Match"
-        else:
-            return "No Match"
+        return _QUALITY_LABELS[bisect.bisect_right(_QUALITY_LABEL_BOUNDS, score)]
     
     def get_tm_quality_color(self, score: float) -> str:
         """
@@ -285,15 +582,4 @@ class TMCalculationService:
         Returns:
             Color code string (for CSS classes)
         """
-        if score >= 0.95:
-            return "green"
-        elif score >= 0.85:
-            return "blue"
-        elif score >= 0.75:
-            return "yellow"
-        elif score >= 0.60:
-            return "orange"
-        elif score >= 0.40:
-            return "red"
-        else:
-            return "gray"
+        return _QUALITY_COLORS[bisect.bisect_right(_QUALITY_COLOR_BOUNDS, score)]
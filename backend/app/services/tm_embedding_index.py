@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from typing import Dict, List
+import numpy as np
+from cachetools import TTLCache
+from app.config import settings
+from app.models import TranslationMemoryResponse
+# Optional semantic TM retrieval - requires faiss and sentence-transformers
+try:
+    import faiss
+    from sentence_transformers import SentenceTransformer
+    EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    EMBEDDINGS_AVAILABLE = False
+    if settings.tm_embedding_index_enabled:
+        print("Warning: faiss or sentence-transformers not available. TM embedding index is disabled.")
+
+
+logger = logging.getLogger(__name__)
+
+# Series with fewer TM entries are left to the trigram candidates alone
+TM_EMBEDDING_MIN_ENTRIES = 200
+
+# Above this many entries an inverted-file, product-quantized index replaces the exact
+# flat index, storing ~1 byte per subvector instead of 4 bytes per dimension
+TM_EMBEDDING_IVFPQ_MIN_ENTRIES = 10000
+_IVF_NLIST = 64
+_IVF_NPROBE = 8
+_PQ_MAX_SUBQUANTIZERS = 48
+_PQ_BITS = 8
+
+# Built indexes per series_id. Dropped when a source text of the series' TM changes through
+# TranslationMemoryService and otherwise rebuilt after the same TTL as its entry cache.
+_series_indexes: TTLCache = TTLCache(maxsize=32, ttl=300)
+
+# Embeddings by source text so rebuilding an index only encodes new or edited texts
+_embeddings_by_text: Dict[str, np.ndarray] = {}
+_EMBEDDINGS_BY_TEXT_MAX_SIZE = 200000
+
+_model = None
+
+
+def embedding_index_enabled() -> bool:
+    """Whether semantic TM candidate retrieval is configured and its packages are installed"""
+    return settings.tm_embedding_index_enabled and EMBEDDINGS_AVAILABLE
+
+
+def invalidate_series_index(series_id: str) -> None:
+    """Drop the embedding index of a series after one of its TM entries changed"""
+    _series_indexes.pop(series_id, None)
+
+
+def _get_model():
+    """Load the sentence-transformer model on first use"""
+    global _model
+    if _model is None:
+        _model = SentenceTransformer(settings.tm_embedding_model)
+    return _model
+
+
+def _encode(texts: List[str]) -> np.ndarray:
+    """Encode texts into unit-length float32 vectors so inner product is cosine similarity"""
+    missing = [text for text in dict.fromkeys(texts) if text not in _embeddings_by_text]
+    if missing:
+        if len(_embeddings_by_text) + len(missing) > _EMBEDDINGS_BY_TEXT_MAX_SIZE:
+            _embeddings_by_text.clear()
+        vectors = _get_model().encode(missing, normalize_embeddings=True, convert_to_numpy=True)
+        _embeddings_by_text.update(zip(missing, vectors.astype(np.float32)))
+
+    return np.stack([_embeddings_by_text[text] for text in texts])
+
+
+def _pq_subquantizers(dimension: int) -> int:
+    """Largest number of PQ subquantizers up to the maximum that evenly divides dimension"""
+    for subquantizers in range(min(_PQ_MAX_SUBQUANTIZERS, dimension), 0, -1):
+        if dimension % subquantizers == 0:
+            return subquantizers
+    return 1
+
+
+class TMEmbeddingIndex:
+    """Cosine-similarity index over the source texts of one series' TM entries"""
+
+    def __init__(self, tm_entries: List[TranslationMemoryResponse]):
+        # Only ids are kept so target text and usage changes never need a rebuild
+        self.entry_ids = [tm_entry.id for tm_entry in tm_entries]
+
+        embeddings = _encode([tm_entry.source_text for tm_entry in tm_entries])
+        dimension = embeddings.shape[1]
+        if len(tm_entries) >= TM_EMBEDDING_IVFPQ_MIN_ENTRIES:
+            # The coarse quantizer must stay referenced for the lifetime of the IVF index
+            self.quantizer = faiss.IndexFlatIP(dimension)
+            self.index = faiss.IndexIVFPQ(
+                self.quantizer,
+                dimension,
+                _IVF_NLIST,
+                _pq_subquantizers(dimension),
+                _PQ_BITS,
+                faiss.METRIC_INNER_PRODUCT
+            )
+            self.index.train(embeddings)
+            self.index.nprobe = _IVF_NPROBE
+        else:
+            self.index = faiss.IndexFlatIP(dimension)
+        self.index.add(embeddings)
+
+    def search(self, text: str, k: int) -> List[str]:
+        """Get the ids of up to k TM entries whose source text is semantically closest to text"""
+        _, positions = self.index.search(_encode([text]), min(k, len(self.entry_ids)))
+        return [self.entry_ids[position] for position in positions[0] if position >= 0]
+
+
+async def search_tm_embedding_candidates(
+    tm_service,
+    series_id: str,
+    text: str,
+    k: int = 32
+) -> List[TranslationMemoryResponse]:
+    """
+    Get the k TM entries of a series closest to text by embedding similarity
+
+    Returns an empty list for series too small to need an index. Model inference
+    and index building run in a worker thread to keep the event loop free. Matches
+    are resolved against the current entries, so their target text is never stale.
+    """
+    tm_entries = [
+        tm_entry for tm_entry in await tm_service.get_all_tm_entries_for_analysis(series_id)
+        if tm_entry.source_text
+    ]
+    index = _series_indexes.get(series_id)
+    if index is None:
+        if len(tm_entries) < TM_EMBEDDING_MIN_ENTRIES:
+            return []
+
+        logger.info("🧠 Building TM embedding index for series %s (%d entries)", series_id, len(tm_entries))
+        index = await asyncio.to_thread(TMEmbeddingIndex, tm_entries)
+        _series_indexes[series_id] = index
+
+    entries_by_id = {tm_entry.id: tm_entry for tm_entry in tm_entries}
+    entry_ids = await asyncio.to_thread(index.search, text, k)
+    return [entries_by_id[entry_id] for entry_id in entry_ids if entry_id in entries_by_id]
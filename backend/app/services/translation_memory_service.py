@@ -1,11 +1,22 @@
-from datetime import datetime
+import logging
 from typing import List, Optional
+from cachetools import TTLCache
 from supabase import Client
 from app.models import (
     TranslationMemoryResponse,
     TranslationMemoryCreate,
     TranslationMemoryUpdate
 )
+from app.services.tm_embedding_index import invalidate_series_index
+
+
+logger = logging.getLogger(__name__)
+
+
+# Full TM entry lists per series_id used by analysis and TM scoring scans. Shared at
+# module level because the service is created per request; entries written through
+# this service invalidate their series, other writers are picked up after the TTL.
+_series_entries_cache: TTLCache = TTLCache(maxsize=128, ttl=300)
 
 
 class TranslationMemoryService:
@@ -18,15 +29,13 @@ class TranslationMemoryService:
     async def create_tm_entry(self, tm_data: TranslationMemoryCreate) -> TranslationMemoryResponse:
         """Create a new translation memory entry"""
         try:
-            # Prepare data for insertion with defaults
+            # Prepare data for insertion with defaults; timestamps default to now() in the database
             insert_data = {
                 "series_id": tm_data.series_id,
                 "source_text": tm_data.source_text,
                 "target_text": tm_data.target_text,
                 "context": tm_data.context,
-                "usage_count": 0,  # Default to 0
-                "created_at": datetime.utcnow().isoformat(),
-                "updated_at": datetime.utcnow().isoformat()
+                "usage_count": 0  # Default to 0
             }
             
             # Insert into database
@@ -36,13 +45,44 @@ class TranslationMemoryService:
                 raise Exception("Failed to create TM entry - no data returned")
             
             tm_entry_data = response.data[0]
+            self._invalidate_series_cache(tm_data.series_id)
             
             return TranslationMemoryResponse(**tm_entry_data)
             
         except Exception as e:
-            print(f"❌ Error creating TM entry: {str(e)}")
+            logger.error("❌ Error creating TM entry: %s", e)
             raise Exception(f"Failed to create TM entry: {str(e)}")
     
+    async def create_tm_entry_for_text_box(
+        self,
+        text_box_id: str,
+        source_text: str,
+        target_text: str,
+        context: Optional[str] = None
+    ) -> Optional[TranslationMemoryResponse]:
+        """Create a TM entry in the series that owns a text box, resolving the series inside the database"""
+        try:
+            response = self.supabase.rpc(
+                "create_tm_for_text_box",
+                {
+                    "p_text_box_id": text_box_id,
+                    "p_source_text": source_text,
+                    "p_target_text": target_text,
+                    "p_context": context
+                }
+            ).execute()
+
+            if not response.data:
+                logger.warning("⚠️ Could not resolve series for text box %s", text_box_id)
+                return None
+
+            self._invalidate_series_cache(response.data[0].get("series_id"))
+            return TranslationMemoryResponse(**response.data[0])
+
+        except Exception as e:
+            logger.error("❌ Error creating TM entry for text box %s: %s", text_box_id, e)
+            raise Exception(f"Failed to create TM entry for text box: {str(e)}")
+
     async def get_tm_entries_by_series(self, series_id: str, skip: int = 0, limit: int = 100) -> List[TranslationMemoryResponse]:
         try:
             # Query with pagination and ordering by created_at
@@ -58,12 +98,12 @@ class TranslationMemoryService:
             if not response.data:
                 return []
 
-            tm_entries_list = [TranslationMemoryResponse(**entry) for entry in response.data]
+            tm_entries_list = [TranslationMemoryResponse.model_construct(**entry) for entry in response.data]
 
             return tm_entries_list
 
         except Exception as e:
-            print(f"❌ Error fetching TM entries for series {series_id}: {str(e)}")
+            logger.error("❌ Error fetching TM entries for series %s: %s", series_id, e)
             raise Exception(f"Failed to fetch TM entries: {str(e)}")
 
     async def get_tm_entries_count_by_series(self, series_id: str) -> int:
@@ -79,7 +119,7 @@ class TranslationMemoryService:
             return response.count or 0
 
         except Exception as e:
-            print(f"❌ Error fetching TM entries count for series {series_id}: {str(e)}")
+            logger.error("❌ Error fetching TM entries count for series %s: %s", series_id, e)
             raise Exception(f"Failed to fetch TM entries count: {str(e)}")
     
     async def get_tm_entry_by_id(self, tm_id: str) -> Optional[TranslationMemoryResponse]:
@@ -93,25 +133,23 @@ class TranslationMemoryService:
             )
             
             if not response.data:
-                print(f"❌ TM entry with ID {tm_id} not found")
+                logger.debug("❌ TM entry with ID %s not found", tm_id)
                 return None
             
             tm_entry_data = response.data[0]
             
-            return TranslationMemoryResponse(**tm_entry_data)
+            return TranslationMemoryResponse.model_validate(tm_entry_data)
             
         except Exception as e:
-            print(f"❌ Error fetching TM entry {tm_id}: {str(e)}")
+            logger.error("❌ Error fetching TM entry %s: %s", tm_id, e)
             raise Exception(f"Failed to fetch TM entry: {str(e)}")
     
     async def update_tm_entry(self, tm_id: str, tm_data: TranslationMemoryUpdate) -> Optional[TranslationMemoryResponse]:
         """Update an existing translation memory entry"""
         try:
-            # Prepare update data (only include non-None fields)
+            # Prepare update data (only include non-None fields); updated_at is set by a trigger
             update_data = tm_data.model_dump(exclude_unset=True)
             if update_data:
-                update_data["updated_at"] = datetime.utcnow().isoformat()
-                
                 response = (
                     self.supabase.table(self.table_name)
                     .update(update_data)
@@ -120,10 +158,11 @@ class TranslationMemoryService:
                 )
                 
                 if not response.data:
-                    print(f"❌ TM entry with ID {tm_id} not found for update")
+                    logger.debug("❌ TM entry with ID %s not found for update", tm_id)
                     return None
                 
                 updated_tm_entry = response.data[0]
+                self._invalidate_series_cache(updated_tm_entry.get("series_id"), "source_text" in update_data)
                 
                 return TranslationMemoryResponse(**updated_tm_entry)
             else:
@@ -131,51 +170,46 @@ class TranslationMemoryService:
                 return await self.get_tm_entry_by_id(tm_id)
                 
         except Exception as e:
-            print(f"❌ Error updating TM entry {tm_id}: {str(e)}")
+            logger.error("❌ Error updating TM entry %s: %s", tm_id, e)
             raise Exception(f"Failed to update TM entry: {str(e)}")
     
     async def delete_tm_entry(self, tm_id: str) -> bool:
         """Delete a translation memory entry"""
         try:
-            # First check if TM entry exists
-            existing_tm_entry = await self.get_tm_entry_by_id(tm_id)
-            if not existing_tm_entry:
-                print(f"❌ TM entry with ID {tm_id} not found for deletion")
-                return False
-            
-            # Delete from database
+            # Delete from database; the deleted row comes back if the entry existed
             response = (
                 self.supabase.table(self.table_name)
                 .delete()
                 .eq("id", tm_id)
                 .execute()
             )
+
+            if not response.data:
+                logger.debug("❌ TM entry with ID %s not found for deletion", tm_id)
+                return False
+
+            self._invalidate_series_cache(response.data[0].get("series_id"))
             
             return True
             
         except Exception as e:
-            print(f"❌ Error deleting TM entry {tm_id}: {str(e)}")
+            logger.error("❌ Error deleting TM entry %s: %s", tm_id, e)
             raise Exception(f"Failed to delete TM entry: {str(e)}")
     
-    async def increment_usage_count(self, tm_id: str) -> Optional[TranslationMemoryResponse]:
-        """Increment the usage count for a translation memory entry"""
+    async def search_tm_entries(self, series_id: str, search_text: str, limit: int = 10) -> List[TranslationMemoryResponse]:
+        """Search TM entries by source or target text, ranked in the database by trigram similarity"""
         try:
-            # Get current entry
-            current_entry = await self.get_tm_entry_by_id(tm_id)
-            if not current_entry:
-                return None
-            
-            # Update usage count
-            new_usage_count = current_entry.usage_count + 1
-            update_data = TranslationMemoryUpdate(usage_count=new_usage_count)
-            
-            return await self.update_tm_entry(tm_id, update_data)
-            
+            response = self.supabase.rpc(
+                "search_tm_entries",
+                {"p_series_id": series_id, "p_query": search_text, "p_limit": limit}
+            ).execute()
         except Exception as e:
-            print(f"❌ Error incrementing usage count for TM entry {tm_id}: {str(e)}")
-            raise Exception(f"Failed to increment usage count: {str(e)}")
-    
-    async def search_tm_entries(self, series_id: str, search_text: str, limit: int = 10) -> List[TranslationMemoryResponse]:
+            logger.warning("⚠️ TM search function unavailable, falling back to ILIKE search: %s", e)
+            return await self._search_tm_entries_ilike(series_id, search_text, limit)
+
+        return [TranslationMemoryResponse.model_construct(**entry) for entry in response.data or []]
+
+    async def _search_tm_entries_ilike(self, series_id: str, search_text: str, limit: int) -> List[TranslationMemoryResponse]:
         try:
             # Search in both source_text and target_text using ilike (case-insensitive)
             response = (
@@ -191,31 +225,43 @@ class TranslationMemoryService:
             if not response.data:
                 return []
 
-            tm_entries_list = [TranslationMemoryResponse(**entry) for entry in response.data]
+            tm_entries_list = [TranslationMemoryResponse.model_construct(**entry) for entry in response.data]
 
             return tm_entries_list
 
         except Exception as e:
-            print(f"Error searching TM entries: {str(e)}")
+            logger.error("❌ Error searching TM entries: %s", e)
             raise Exception(f"Failed to search TM entries: {str(e)}")
 
     async def increment_usage_count(self, tm_id: str) -> Optional[TranslationMemoryResponse]:
-        """Increment the usage count for a translation memory entry"""
+        """Increment the usage count for a translation memory entry in a single atomic update"""
+        try:
+            response = self.supabase.rpc("increment_tm_usage", {"p_id": tm_id}).execute()
+        except Exception as e:
+            logger.warning("⚠️ increment_tm_usage function unavailable, falling back to read-then-update: %s", e)
+            return await self._increment_usage_count_read_write(tm_id)
+
+        if not response.data:
+            logger.debug("❌ TM entry with ID %s not found", tm_id)
+            return None
+
+        updated_tm_entry = response.data[0]
+        self._invalidate_series_cache(updated_tm_entry.get("series_id"), source_changed=False)
+        return TranslationMemoryResponse.model_validate(updated_tm_entry)
+
+    async def _increment_usage_count_read_write(self, tm_id: str) -> Optional[TranslationMemoryResponse]:
         try:
             # First get the current entry to get the current usage_count
             current_entry = await self.get_tm_entry_by_id(tm_id)
             if not current_entry:
-                print(f"❌ TM entry with ID {tm_id} not found")
+                logger.debug("❌ TM entry with ID %s not found", tm_id)
                 return None
 
             # Increment usage count
             new_usage_count = current_entry.usage_count + 1
 
             # Update the entry
-            update_data = {
-                "usage_count": new_usage_count,
-                "updated_at": datetime.utcnow().isoformat()
-            }
+            update_data = {"usage_count": new_usage_count}
 
             response = (
                 self.supabase.table(self.table_name)
@@ -225,17 +271,69 @@ class TranslationMemoryService:
             )
 
             if not response.data:
-                print(f"❌ Failed to increment usage count for TM entry {tm_id}")
+                logger.debug("❌ Failed to increment usage count for TM entry %s", tm_id)
                 return None
 
             updated_tm_entry = response.data[0]
+            self._invalidate_series_cache(updated_tm_entry.get("series_id"), source_changed=False)
             return TranslationMemoryResponse(**updated_tm_entry)
 
         except Exception as e:
-            print(f"❌ Error incrementing usage count for TM entry {tm_id}: {str(e)}")
+            logger.error("❌ Error incrementing usage count for TM entry %s: %s", tm_id, e)
             raise Exception(f"Failed to increment usage count: {str(e)}")
 
+    async def get_tm_candidates(
+        self,
+        series_id: str,
+        text: str,
+        limit: int = 20,
+        min_similarity: float = 0.3
+    ) -> List[TranslationMemoryResponse]:
+        """Get the TM entries most similar to text, ranked in the database by trigram similarity"""
+        try:
+            response = self.supabase.rpc(
+                "match_tm_candidates",
+                {"p_series_id": series_id, "p_text": text, "p_limit": limit, "p_min_similarity": min_similarity}
+            ).execute()
+
+            if not response.data:
+                return []
+
+            return [TranslationMemoryResponse.model_construct(**entry) for entry in response.data]
+
+        except Exception as e:
+            logger.error("❌ Error fetching TM candidates for series %s: %s", series_id, e)
+            raise Exception(f"Failed to fetch TM candidates: {str(e)}")
+
+    async def get_tm_candidates_batch(
+        self,
+        series_id: str,
+        texts: List[str],
+        limit: int = 20,
+        min_similarity: float = 0.3
+    ) -> List[TranslationMemoryResponse]:
+        """Get the union of the TM entries most similar to each of texts in a single query"""
+        try:
+            response = self.supabase.rpc(
+                "match_tm_candidates_batch",
+                {"p_series_id": series_id, "p_texts": texts, "p_limit": limit, "p_min_similarity": min_similarity}
+            ).execute()
+
+            if not response.data:
+                return []
+
+            return [TranslationMemoryResponse.model_construct(**entry) for entry in response.data]
+
+        except Exception as e:
+            logger.error("❌ Error fetching TM candidates for series %s: %s", series_id, e)
+            raise Exception(f"Failed to fetch TM candidates: {str(e)}")
+
     async def get_all_tm_entries_for_analysis(self, series_id: str) -> List[TranslationMemoryResponse]:
+        """Get all TM entries of a series ordered by usage, served from a short-lived cache"""
+        cached_entries = _series_entries_cache.get(series_id)
+        if cached_entries is not None:
+            return list(cached_entries)
+
         try:
             response = (
                 self.supabase.table(self.table_name)
@@ -245,13 +343,23 @@ class TranslationMemoryService:
                 .execute()
             )
 
-            if not response.data:
-                return []
+            tm_entries_list = [TranslationMemoryResponse.model_construct(**entry) for entry in response.data or []]
+            _series_entries_cache[series_id] = tm_entries_list
 
-            tm_entries_list = [TranslationMemoryResponse(**entry) for entry in response.data]
-
-            return tm_entries_list
+            return list(tm_entries_list)
 
         except Exception as e:
-            print(f"Error fetching all TM entries for series {series_id}: {str(e)}")
+            logger.error("❌ Error fetching all TM entries for series %s: %s", series_id, e)
             raise Exception(f"Failed to fetch TM entries for analysis: {str(e)}")
+
+    def _invalidate_series_cache(self, series_id: Optional[str], source_changed: bool = True) -> None:
+        """
+        Drop the cached TM entries of a series after one of its entries changed
+
+        The embedding index only depends on source texts, so it is kept when just the
+        target text or usage count of an entry changed.
+        """
+        if series_id:
+            _series_entries_cache.pop(series_id, None)
+            if source_changed:
+                invalidate_series_index(series_id)
@@ -1,19 +1,228 @@
+import asyncio
+import hashlib
+import httpx
+import logging
 import openai
+import re
 import time
-from typing import Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from cachetools import LRUCache
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 from app.config import settings
 
 
+logger = logging.getLogger(__name__)
+
+# Parses one "<n>. <translation>" line of a numbered batch response
+_NUMBERED_LINE_RE = re.compile(r'^\s*(\d+)\.\s*(.*)$')
+
+# Completion budget of one text, ~2.5 tokens per source character within these bounds
+_MIN_COMPLETION_TOKENS = 32
+_MAX_COMPLETION_TOKENS = 800
+
+# Cap for a whole numbered batch request, where each line also spends tokens on its number
+_BATCH_MAX_TOKENS = 4096
+_BATCH_LINE_TOKENS = 4
+
+
+def _completion_tokens(text: str) -> int:
+    """max_tokens for translating text, so short bubbles don't reserve the full budget"""
+    return min(_MAX_COMPLETION_TOKENS, max(_MIN_COMPLETION_TOKENS, int(len(text) * 2.5)))
+
+
+# Target languages offered to clients
+_SUPPORTED_LANGUAGES: Tuple[str, ...] = (
+    "Vietnamese",
+    "English",
+    "Spanish",
+    "French",
+    "German",
+    "Italian",
+    "Portuguese",
+    "Russian",
+    "Chinese (Simplified)",
+    "Chinese (Traditional)",
+    "Japanese",
+    "Korean",
+    "Thai",
+    "Indonesian",
+    "Malay"
+)
+
+# Seconds a health check result is reused, so frequent probes don't each hit the API
+_HEALTH_CHECK_TTL = 30.0
+
+# Translations by (source text digest, target language, context digest). Repeated SFX and
+# short lines recur across pages and chapters, so these are served without an API call.
+_translation_cache: LRUCache = LRUCache(maxsize=10000)
+
+
+# Texts OCR reads from panels that stay the same in any language
+_URL_RE = re.compile(r'^(https?://|www\.)\S+$', re.IGNORECASE)
+_CJK_RE = re.compile(r'[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff66-\uff9f]')
+
+
+def _needs_no_translation(text: str) -> bool:
+    """Whether a stripped text can be returned as is without asking the model"""
+    # Korean, Japanese and Chinese text always needs translating, even a single-character SFX
+    if _CJK_RE.search(text):
+        return False
+
+    if _URL_RE.match(text):
+        return True
+
+    # Only punctuation, symbols or numbers
+    return not any(char.isalpha() for char in text)
+
+
+def _translation_cache_key(source_text: str, target_language: str, context: Optional[str]) -> tuple:
+    return (
+        hashlib.blake2b(source_text.encode(), digest_size=16).digest(),
+        target_language,
+        hashlib.blake2b((context or "").encode(), digest_size=16).digest()
+    )
+
+
+class TokenBucketLimiter:
+    """
+    Proactive requests- and tokens-per-minute limiter for OpenAI calls
+
+    Both buckets refill continuously at their per-minute rate. Callers reserve a request
+    and an estimated token count before each call and wait while either bucket is short,
+    so bursts are spread out instead of failing with RateLimitError.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.max_requests = float(requests_per_minute)
+        self.max_tokens = float(tokens_per_minute)
+        self.requests_available = self.max_requests
+        self.tokens_available = self.max_tokens
+        self.last_update: Optional[float] = None
+        # Created on first use so it belongs to the running event loop
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self) -> None:
+        now = asyncio.get_running_loop().time()
+        if self.last_update is not None:
+            elapsed_minutes = (now - self.last_update) / 60
+            self.requests_available = min(self.max_requests, self.requests_available + elapsed_minutes * self.max_requests)
+            self.tokens_available = min(self.max_tokens, self.tokens_available + elapsed_minutes * self.max_tokens)
+        self.last_update = now
+
+    async def acquire(self, requests: int, tokens: int) -> None:
+        """Wait until the requests and tokens are available, then reserve them"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        # A single call larger than the whole budget only has to wait for a full bucket
+        tokens = min(tokens, self.max_tokens)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.requests_available >= requests and self.tokens_available >= tokens:
+                    self.requests_available -= requests
+                    self.tokens_available -= tokens
+                    return
+
+                wait_minutes = max(
+                    (requests - self.requests_available) / self.max_requests,
+                    (tokens - self.tokens_available) / self.max_tokens
+                )
+                await asyncio.sleep(wait_minutes * 60)
+
+    def record_usage(self, reserved_tokens: int, used_tokens: int) -> None:
+        """Return the part of a reservation the call didn't use"""
+        self.tokens_available = min(self.max_tokens, self.tokens_available + reserved_tokens - used_tokens)
+
+    def drain(self) -> None:
+        """Empty both buckets after OpenAI reported a rate limit so other callers back off too"""
+        self.requests_available = 0.0
+        self.tokens_available = 0.0
+
+
+# Connection pool shared by the OpenAI clients of all TranslationService instances so
+# keep-alive connections are reused instead of paying a TLS handshake per request
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=100, keepalive_expiry=30.0),
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared OpenAI connection pool on application shutdown"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _estimate_request_tokens(system_prompt: str, user_prompt: str, max_tokens: int) -> int:
+    """Rough prompt size of ~4 characters per token plus the full completion budget"""
+    return len(system_prompt) // 4 + len(user_prompt) // 4 + max_tokens
+
+
+# Shared by all TranslationService instances since the limits apply per API key
+_rate_limiter = TokenBucketLimiter(
+    settings.openai_requests_per_minute,
+    settings.openai_tokens_per_minute
+)
+
+
 class TranslationService:
+    _PROMPT_TEMPLATE = """You are assisting in the translation and localization of manhwa panels for professional comic production.
+
+Your task is to:
+
+1. Detect and transcribe all text in the image, including:
+   - Dialogue
+   - Narration
+   - Sound effects (SFX)
+   - Overlayed or stylized text
+
+2. Translate each piece of text accurately into {target_language}.
+
+3. Localize the translated text into natural, fluent {target_language} suitable for an official manhwa/webtoon adaptation. Keep the tone appropriate to the context (e.g., dramatic, somber, intense, comedic).
+
+Professional Translation Guidelines:
+- Preserve the original meaning and emotional impact
+- Adapt cultural references and idioms appropriately for {target_language} readers
+- Maintain character voice consistency and personality through dialogue
+- Handle honorifics and formal/informal speech patterns appropriately
+- For sound effects (SFX), either translate to equivalent sounds in {target_language} or keep original if more impactful
+- Preserve proper nouns, character names, and place names unless standard translations exist
+- Ensure dialogue flows naturally when read aloud
+- Consider panel layout and text space constraints for localization
+- Maintain narrative pacing and dramatic timing through translation choices
+
+Text Classification and Handling:
+- DIALOGUE: Character speech - maintain personality and speaking style
+- NARRATION: Story text - keep formal narrative tone
+- THOUGHTS: Internal monologue - often more casual or introspective
+- SFX: Sound effects - prioritize impact over literal translation
+- SIGNS/TEXT: Background text - translate for reader comprehension
+
+Return ONLY the translated text without explanations, formatting, or additional comments."""
+
     def __init__(self):
         self.target_language = settings.translation_target_language
+        self._prompt_cache: Dict[str, str] = {}
+        self._health_result: Optional[dict] = None
+        self._health_checked_at = 0.0
 
         if not settings.openai_api_key:
-            print("Warning: OpenAI API key not configured. Translation service will not work.")
+            logger.warning("⚠️ OpenAI API key not configured. Translation service will not work.")
             self.client = None
             return
 
-        self.client = openai.OpenAI(api_key=settings.openai_api_key)
+        # Async client so translations don't block the event loop while waiting on the API
+        self.client = openai.AsyncOpenAI(api_key=settings.openai_api_key, http_client=_get_http_client())
 
     async def translate_text(
         self,
@@ -32,26 +241,40 @@ class TranslationService:
 
             target_lang = target_language or self.target_language
             
+            # Untranslatable or previously translated texts are answered without an API call
+            stripped_text = source_text.strip()
+            cache_key = _translation_cache_key(stripped_text, target_lang, context)
+            if _needs_no_translation(stripped_text):
+                known_translation = stripped_text
+            else:
+                known_translation = _translation_cache.get(cache_key)
+            if known_translation is not None:
+                return {
+                    "success": True,
+                    "source_text": source_text,
+                    "translated_text": known_translation,
+                    "target_language": target_lang,
+                    "processing_time": time.time() - start_time,
+                    "model": "gpt-4o-mini",
+                    "tokens_used": 0
+                }
+
             # Build the translation prompt
             system_prompt = self._build_system_prompt(target_lang, context)
             user_prompt = f"Translate this text: {source_text.strip()}"
             
             # Call OpenAI API with latest GPT model
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # Use latest GPT model for better accuracy
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=800,  # Maximum response length set to 800 tokens
-                temperature=0.3,  # Lower temperature for more consistent translations
-                top_p=1.0,
-                frequency_penalty=0.0,
-                presence_penalty=0.0
+            translated_text, tokens_used, truncated = await self._create_untruncated_completion(
+                system_prompt,
+                user_prompt,
+                max_tokens=_completion_tokens(stripped_text),
+                max_budget=_MAX_COMPLETION_TOKENS
             )
+            if truncated:
+                logger.warning("⚠️ Translation was cut off at the token limit, not caching it")
+            else:
+                _translation_cache[cache_key] = translated_text
             
-            # Extract translated text
-            translated_text = response.choices[0].message.content.strip()
             processing_time = time.time() - start_time
             
             return {
@@ -61,59 +284,305 @@ class TranslationService:
                 "target_language": target_lang,
                 "processing_time": processing_time,
                 "model": "gpt-4o-mini",
-                "tokens_used": response.usage.total_tokens if response.usage else None
+                "tokens_used": tokens_used
             }
             
         except openai.RateLimitError as e:
-            print(f"OpenAI rate limit exceeded: {str(e)}")
+            logger.warning("⚠️ OpenAI rate limit exceeded: %s", e)
             raise Exception("Translation service is currently busy. Please try again later.")
 
         except openai.AuthenticationError as e:
-            print(f"OpenAI authentication error: {str(e)}")
+            logger.error("❌ OpenAI authentication error: %s", e)
             raise Exception("Translation service authentication failed.")
 
         except openai.APIError as e:
-            print(f"OpenAI API error: {str(e)}")
+            logger.exception("❌ OpenAI API error: %s", e)
             raise Exception(f"Translation service error: {str(e)}")
 
         except Exception as e:
-            print(f"Translation error: {str(e)}")
+            logger.exception("❌ Translation error: %s", e)
             raise Exception(f"Translation failed: {str(e)}")
     
-    def _build_system_prompt(self, target_language: str, context: Optional[str] = None) -> str:
-        base_prompt = f"""You are assisting in the translation and localization of manhwa panels for professional comic production.
+    async def translate_stream(
+        self,
+        source_text: str,
+        target_language: Optional[str] = None,
+        context: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Translate text, yielding the translation in pieces as the model generates it
 
-Your task is to:
+        Cached and untranslatable texts are yielded whole. The completed translation
+        is cached like translate_text results unless it was cut off at the token limit.
+        """
+        if not source_text or not source_text.strip():
+            raise ValueError("Source text cannot be empty")
 
-1. Detect and transcribe all text in the image, including:
-   - Dialogue
-   - Narration
-   - Sound effects (SFX)
-   - Overlayed or stylized text
+        if not self.client:
+            raise ValueError("Translation service is not properly configured. Please check OpenAI API key.")
 
-2. Translate each piece of text accurately into {target_language}.
+        target_lang = target_language or self.target_language
 
-3. Localize the translated text into natural, fluent {target_language} suitable for an official manhwa/webtoon adaptation. Keep the tone appropriate to the context (e.g., dramatic, somber, intense, comedic).
+        stripped_text = source_text.strip()
+        cache_key = _translation_cache_key(stripped_text, target_lang, context)
+        if _needs_no_translation(stripped_text):
+            known_translation = stripped_text
+        else:
+            known_translation = _translation_cache.get(cache_key)
+        if known_translation is not None:
+            yield known_translation
+            return
 
-Professional Translation Guidelines:
-- Preserve the original meaning and emotional impact
-- Adapt cultural references and idioms appropriately for {target_language} readers
-- Maintain character voice consistency and personality through dialogue
-- Handle honorifics and formal/informal speech patterns appropriately
-- For sound effects (SFX), either translate to equivalent sounds in {target_language} or keep original if more impactful
-- Preserve proper nouns, character names, and place names unless standard translations exist
-- Ensure dialogue flows naturally when read aloud
-- Consider panel layout and text space constraints for localization
-- Maintain narrative pacing and dramatic timing through translation choices
+        system_prompt = self._build_system_prompt(target_lang, context)
+        user_prompt = f"Translate this text: {stripped_text}"
+        max_tokens = _completion_tokens(stripped_text)
+        reserved_tokens = _estimate_request_tokens(system_prompt, user_prompt, max_tokens)
+        await _rate_limiter.acquire(1, reserved_tokens)
 
-Text Classification and Handling:
-- DIALOGUE: Character speech - maintain personality and speaking style
-- NARRATION: Story text - keep formal narrative tone
-- THOUGHTS: Internal monologue - often more casual or introspective
-- SFX: Sound effects - prioritize impact over literal translation
-- SIGNS/TEXT: Background text - translate for reader comprehension
+        try:
+            stream = await self.client.chat.completions.create(
+                **self._completion_body(system_prompt, user_prompt, max_tokens),
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+        except openai.RateLimitError:
+            _rate_limiter.drain()
+            raise
 
-Return ONLY the translated text without explanations, formatting, or additional comments."""
+        parts: List[str] = []
+        finish_reason = None
+        async for chunk in stream:
+            if chunk.usage:
+                _rate_limiter.record_usage(reserved_tokens, chunk.usage.total_tokens)
+            if chunk.choices:
+                finish_reason = chunk.choices[0].finish_reason or finish_reason
+                if chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+
+        translated_text = "".join(parts).strip()
+        if finish_reason == "length":
+            logger.warning("⚠️ Streamed translation was cut off at max_tokens=%d, not caching it", max_tokens)
+        elif translated_text:
+            _translation_cache[cache_key] = translated_text
+
+    async def translate_batch(
+        self,
+        source_texts: List[str],
+        target_language: Optional[str] = None,
+        context: Optional[str] = None
+    ) -> dict:
+        """
+        Translate several texts (e.g. all bubbles of a page) in a single API request
+
+        The texts are sent as a numbered list and the numbered response is parsed back
+        in order. A response that does not contain exactly one line per text is retried
+        as two half-size batches.
+
+        Returns:
+            Dictionary with the translations in the order of source_texts and metadata
+        """
+        try:
+            start_time = time.time()
+
+            if not source_texts or any(not text or not text.strip() for text in source_texts):
+                raise ValueError("Source texts cannot be empty")
+
+            if not self.client:
+                raise ValueError("Translation service is not properly configured. Please check OpenAI API key.")
+
+            target_lang = target_language or self.target_language
+
+            # Each text must stay on its own numbered line
+            texts = [" ".join(text.split()) for text in source_texts]
+            cache_keys = [_translation_cache_key(text, target_lang, context) for text in texts]
+            translated_texts = [
+                text if _needs_no_translation(text) else _translation_cache.get(cache_key)
+                for text, cache_key in zip(texts, cache_keys)
+            ]
+
+            # Only texts without a known translation are sent, each distinct text once
+            missing_texts = list(dict.fromkeys(
+                text for text, translated_text in zip(texts, translated_texts) if translated_text is None
+            ))
+            tokens_used = 0
+            if missing_texts:
+                new_translations, tokens_used, truncated = await self._translate_numbered(missing_texts, target_lang, context)
+                translations_by_text = dict(zip(missing_texts, new_translations))
+                truncated_texts = {text for text, text_truncated in zip(missing_texts, truncated) if text_truncated}
+                for index, text in enumerate(texts):
+                    if translated_texts[index] is None:
+                        translated_texts[index] = translations_by_text[text]
+                        # Translations cut off at the token limit are returned but not cached
+                        if text not in truncated_texts:
+                            _translation_cache[cache_keys[index]] = translated_texts[index]
+
+            processing_time = time.time() - start_time
+
+            return {
+                "success": True,
+                "source_texts": source_texts,
+                "translated_texts": translated_texts,
+                "target_language": target_lang,
+                "processing_time": processing_time,
+                "model": "gpt-4o-mini",
+                "tokens_used": tokens_used
+            }
+
+        except openai.RateLimitError as e:
+            logger.warning("⚠️ OpenAI rate limit exceeded: %s", e)
+            raise Exception("Translation service is currently busy. Please try again later.")
+
+        except openai.AuthenticationError as e:
+            logger.error("❌ OpenAI authentication error: %s", e)
+            raise Exception("Translation service authentication failed.")
+
+        except openai.APIError as e:
+            logger.exception("❌ OpenAI API error: %s", e)
+            raise Exception(f"Translation service error: {str(e)}")
+
+        except Exception as e:
+            logger.exception("❌ Batch translation error: %s", e)
+            raise Exception(f"Batch translation failed: {str(e)}")
+
+    async def _translate_numbered(
+        self,
+        texts: List[str],
+        target_language: str,
+        context: Optional[str]
+    ) -> Tuple[List[str], int, List[bool]]:
+        """
+        Translate texts with one numbered-list request, halving the batch when the response can't be parsed
+
+        Returns the translations, the tokens used and whether each translation was cut
+        off at the token limit.
+        """
+        system_prompt = self._build_system_prompt(target_language, context)
+        if len(texts) == 1:
+            content, tokens_used, truncated = await self._create_untruncated_completion(
+                system_prompt,
+                f"Translate this text: {texts[0]}",
+                max_tokens=_completion_tokens(texts[0]),
+                max_budget=_MAX_COMPLETION_TOKENS
+            )
+            if truncated:
+                logger.warning("⚠️ Translation was cut off at the token limit")
+            return [content], tokens_used, [truncated]
+
+        system_prompt += (
+            f"\n\nThe input is a numbered list of {len(texts)} separate texts. Translate each one on its own "
+            f"and answer with exactly {len(texts)} lines in the same order, formatted as \"1. <translation>\", "
+            f"\"2. <translation>\" and so on, one line per text."
+        )
+        user_prompt = "Translate each numbered line:\n" + "\n".join(
+            f"{number}. {text}" for number, text in enumerate(texts, 1)
+        )
+        max_tokens = min(_BATCH_MAX_TOKENS, sum(_completion_tokens(text) + _BATCH_LINE_TOKENS for text in texts))
+
+        content, tokens_used, truncated = await self._create_completion(system_prompt, user_prompt, max_tokens)
+        tokens_used = tokens_used or 0
+
+        # A cut-off response may still parse, with its last line incomplete
+        translated_texts = None if truncated else self._parse_numbered_response(content, len(texts))
+        if translated_texts is not None:
+            return translated_texts, tokens_used, [False] * len(texts)
+
+        logger.warning(
+            "⚠️ Batch translation of %d texts was cut off or returned an unexpected number of lines, splitting batch",
+            len(texts)
+        )
+        middle = len(texts) // 2
+        first_half, first_tokens, first_truncated = await self._translate_numbered(texts[:middle], target_language, context)
+        second_half, second_tokens, second_truncated = await self._translate_numbered(texts[middle:], target_language, context)
+        return first_half + second_half, tokens_used + first_tokens + second_tokens, first_truncated + second_truncated
+
+    def _completion_body(self, system_prompt: str, user_prompt: str, max_tokens: int) -> dict:
+        """Chat completion parameters shared by regular and streaming requests"""
+        return {
+            "model": "gpt-4o-mini",  # Use latest GPT model for better accuracy
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "max_tokens": max_tokens,
+            "temperature": 0.3,  # Lower temperature for more consistent translations
+            "top_p": 1.0,
+            "frequency_penalty": 0.0,
+            "presence_penalty": 0.0
+        }
+
+    @retry(
+        retry=retry_if_exception_type(openai.RateLimitError),
+        wait=wait_random_exponential(min=1, max=60),
+        stop=stop_after_attempt(6),
+        reraise=True
+    )
+    async def _create_completion(self, system_prompt: str, user_prompt: str, max_tokens: int) -> Tuple[str, Optional[int], bool]:
+        """
+        Run one chat completion within the shared rate limits
+
+        Returns its text, total tokens and whether it was cut off at max_tokens.
+        """
+        reserved_tokens = _estimate_request_tokens(system_prompt, user_prompt, max_tokens)
+        await _rate_limiter.acquire(1, reserved_tokens)
+
+        try:
+            response = await self.client.chat.completions.create(
+                **self._completion_body(system_prompt, user_prompt, max_tokens)
+            )
+        except openai.RateLimitError:
+            _rate_limiter.drain()
+            raise
+
+        tokens_used = response.usage.total_tokens if response.usage else None
+        if tokens_used is not None:
+            _rate_limiter.record_usage(reserved_tokens, tokens_used)
+
+        choice = response.choices[0]
+        return choice.message.content.strip(), tokens_used, choice.finish_reason == "length"
+
+    async def _create_untruncated_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        max_budget: int
+    ) -> Tuple[str, int, bool]:
+        """Run a chat completion, repeating it once with max_budget tokens if it was cut off at max_tokens"""
+        content, tokens_used, truncated = await self._create_completion(system_prompt, user_prompt, max_tokens)
+        tokens_used = tokens_used or 0
+        if truncated and max_tokens < max_budget:
+            logger.warning("⚠️ Translation was cut off at max_tokens=%d, retrying with %d", max_tokens, max_budget)
+            content, retry_tokens, truncated = await self._create_completion(system_prompt, user_prompt, max_budget)
+            tokens_used += retry_tokens or 0
+        return content, tokens_used, truncated
+
+    def _parse_numbered_response(self, content: str, expected_count: int) -> Optional[List[str]]:
+        """Get the translations of a numbered response in order, or None if it doesn't have one per text"""
+        lines = [line.strip() for line in content.splitlines() if line.strip()]
+
+        numbered = {}
+        for line in lines:
+            match = _NUMBERED_LINE_RE.match(line)
+            if match:
+                numbered.setdefault(int(match.group(1)), match.group(2).strip())
+
+        if set(numbered) == set(range(1, expected_count + 1)):
+            return [numbered[number] for number in range(1, expected_count + 1)]
+
+        # Unnumbered answer with one line per text
+        if not numbered and len(lines) == expected_count:
+            return lines
+
+        return None
+
+    def _build_system_prompt(self, target_language: str, context: Optional[str] = None) -> str:
+        # The prompt only depends on the target language, so build it once per language;
+        # byte-identical prompts also let OpenAI reuse its server-side prompt cache
+        base_prompt = self._prompt_cache.get(target_language)
+        if base_prompt is None:
+            base_prompt = self._PROMPT_TEMPLATE.format(target_language=target_language)
+            self._prompt_cache[target_language] = base_prompt
 
         if context:
             base_prompt += f"\n\nAdditional context for this translation: {context}"
@@ -160,41 +629,35 @@ Return ONLY the translated text without explanations, formatting, or additional
             )
             
         except Exception as e:
-            print(f"❌ Enhanced translation error: {str(e)}")
+            logger.exception("❌ Enhanced translation error: %s", e)
             raise Exception(f"Enhanced translation failed: {str(e)}")
     
-    def get_supported_languages(self) -> list:
-        return [
-            "Vietnamese",
-            "English", 
-            "Spanish",
-            "French",
-            "German",
-            "Italian",
-            "Portuguese",
-            "Russian",
-            "Chinese (Simplified)",
-            "Chinese (Traditional)",
-            "Japanese",
-            "Korean",
-            "Thai",
-            "Indonesian",
-            "Malay"
-        ]
+    def get_supported_languages(self) -> Tuple[str, ...]:
+        return _SUPPORTED_LANGUAGES
     
     async def health_check(self) -> dict:
+        """Check that the OpenAI API is reachable with the configured key, reusing the result for a short while"""
+        if self._health_result is not None and time.monotonic() - self._health_checked_at < _HEALTH_CHECK_TTL:
+            return self._health_result
+
         try:
-            # Simple test translation
-            test_result = await self.translate_text("Hello", "Vietnamese")
-            return {
+            if not self.client:
+                raise ValueError("Translation service is not properly configured. Please check OpenAI API key.")
+
+            # Listing models verifies connectivity and the key without spending tokens
+            await self.client.models.list()
+            health_result = {
                 "status": "healthy",
                 "service": "OpenAI GPT Translation",
-                "target_language": self.target_language,
-                "test_successful": test_result["success"]
+                "target_language": self.target_language
             }
         except Exception as e:
-            return {
+            health_result = {
                 "status": "unhealthy",
                 "service": "OpenAI GPT Translation",
                 "error": str(e)
             }
+
+        self._health_result = health_result
+        self._health_checked_at = time.monotonic()
+        return health_result
@@ -1,10 +1,14 @@
-from datetime import datetime
+import logging
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 from supabase import Client
 from app.models import UserCreate, UserUpdate, UserResponse, UserRole, CreateUserRequest
 from fastapi import HTTPException, status
 
 
+logger = logging.getLogger(__name__)
+
+
 class UserService:
     """Service for user-related operations"""
     
@@ -15,39 +19,43 @@ class UserService:
     async def create_user(self, user_data: CreateUserRequest) -> UserResponse:
         """Create a new user in the database or return existing user"""
         try:
-            # First, check if user already exists
-            existing_user = await self.get_user_by_id(user_data.user_id)
-            if existing_user:
-                return existing_user
-
             # Prepare user data for insertion
+            now = datetime.now(timezone.utc).isoformat()
             user_dict = {
                 "id": user_data.user_id,
                 "email": user_data.email,
                 "name": user_data.name,
                 "role": user_data.role.value,
                 "avatar_url": user_data.avatar_url or "",  # Ensure avatar_url is never null
-                "created_at": datetime.utcnow().isoformat(),
-                "updated_at": datetime.utcnow().isoformat()
+                "created_at": now,
+                "updated_at": now
             }
 
-            # Insert user into database
-            response = self.supabase.table(self.table_name).insert(user_dict).execute()
+            # Insert user into database; an existing user with the same ID is left untouched
+            response = (
+                self.supabase.table(self.table_name)
+                .upsert(user_dict, on_conflict="id", ignore_duplicates=True)
+                .execute()
+            )
 
             if not response.data:
+                # No row returned means the user already existed
+                existing_user = await self.get_user_by_id(user_data.user_id)
+                if existing_user:
+                    return existing_user
+
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Failed to create user - no data returned from database"
                 )
 
-            return UserResponse(**response.data[0])
+            return UserResponse.model_validate(response.data[0])
 
         except HTTPException:
             # Re-raise HTTP exceptions as-is
             raise
         except Exception as e:
-            print(f"Error creating user: {str(e)}")
-            print(f"Error type: {type(e)}")
+            logger.exception("❌ Error creating user: %s", e)
 
             if "duplicate key value" in str(e).lower() or "already exists" in str(e).lower():
                 # User already exists, fetch and return the existing user
@@ -56,7 +64,7 @@ class UserService:
                     if existing_user:
                         return existing_user
                 except Exception as fetch_error:
-                    print(f"Failed to fetch existing user: {fetch_error}")
+                    logger.warning("⚠️ Failed to fetch existing user: %s", fetch_error)
 
                 # If we can't fetch the existing user, still return a conflict error
                 raise HTTPException(
@@ -77,7 +85,7 @@ class UserService:
             if not response.data:
                 return None
             
-            return UserResponse(**response.data[0])
+            return UserResponse.model_validate(response.data[0])
             
         except Exception as e:
             raise HTTPException(
@@ -93,7 +101,7 @@ class UserService:
             if not response.data:
                 return None
             
-            return UserResponse(**response.data[0])
+            return UserResponse.model_validate(response.data[0])
             
         except Exception as e:
             raise HTTPException(
@@ -101,18 +109,22 @@ class UserService:
                 detail=f"Failed to get user: {str(e)}"
             )
     
-    async def get_all_users(self, limit: int = 100, offset: int = 0) -> List[UserResponse]:
-        """Get all users with pagination"""
+    async def get_all_users(self, limit: int = 100, offset: int = 0) -> Dict[str, Any]:
+        """Get a page of users together with the total number of users"""
         try:
             response = (
                 self.supabase.table(self.table_name)
-                .select("*")
+                .select("*", count="exact")
                 .order("created_at", desc=True)
                 .range(offset, offset + limit - 1)
                 .execute()
             )
             
-            return [UserResponse(**user) for user in response.data]
+            # Rows come straight from the users table, so skip per-row validation
+            return {
+                "items": [UserResponse.model_construct(**user) for user in response.data],
+                "total": response.count or 0
+            }
             
         except Exception as e:
             raise HTTPException(
@@ -123,14 +135,6 @@ class UserService:
     async def update_user(self, user_id: str, user_data: UserUpdate) -> UserResponse:
         """Update user information"""
         try:
-            # First check if user exists
-            existing_user = await self.get_user_by_id(user_id)
-            if not existing_user:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="User not found"
-                )
-
             # Prepare update data - only include fields that are not None
             update_dict = {}
             if user_data.name is not None:
@@ -142,11 +146,17 @@ class UserService:
 
             # If no fields to update, return existing user
             if not update_dict:
+                existing_user = await self.get_user_by_id(user_id)
+                if not existing_user:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="User not found"
+                    )
                 return existing_user
 
-            update_dict["updated_at"] = datetime.utcnow().isoformat()
+            update_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
 
-            # Update user in database
+            # Update user in database; no row comes back if the user doesn't exist
             response = (
                 self.supabase.table(self.table_name)
                 .update(update_dict)
@@ -157,15 +167,15 @@ class UserService:
             if not response.data:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
-                    detail="User not found or update failed"
+                    detail="User not found"
                 )
 
-            return UserResponse(**response.data[0])
+            return UserResponse.model_validate(response.data[0])
 
         except HTTPException:
             raise
         except Exception as e:
-            print(f"Error updating user {user_id}: {str(e)}")
+            logger.exception("❌ Error updating user %s: %s", user_id, e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to update user: {str(e)}"
@@ -189,7 +199,7 @@ class UserService:
         try:
             update_dict = {
                 "role": new_role.value,
-                "updated_at": datetime.utcnow().isoformat()
+                "updated_at": datetime.now(timezone.utc).isoformat()
             }
             
             response = (
@@ -205,7 +215,7 @@ class UserService:
                     detail="User not found"
                 )
             
-            return UserResponse(**response.data[0])
+            return UserResponse.model_validate(response.data[0])
             
         except HTTPException:
             raise
@@ -1,49 +1,130 @@
 from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
-import json
-from typing import Dict, Set
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager
+import asyncio
+import logging
+import logging.handlers
+import queue
+import orjson
+from typing import Dict, List
 from app.config import settings
 from app.routers import users, series, chapters, pages, translation_memory, ocr, translation, text_boxes, ai_glossary, dashboard
 from app.services.notification_service import notification_service
-
+from app.services.translation_service import close_http_client
+
+# Application logging - records are queued and written to stderr by a background thread so
+# request handlers never wait on log IO; debug output from app modules only in debug mode
+log_queue: queue.Queue = queue.Queue(-1)
+log_stream_handler = logging.StreamHandler()
+log_stream_handler.setFormatter(logging.Formatter("%(levelname)s:     %(name)s - %(message)s"))
+log_listener = logging.handlers.QueueListener(log_queue, log_stream_handler)
+log_listener.start()
+# The queue handler only renders the message (and traceback); layout is left to the stream handler
+log_queue_handler = logging.handlers.QueueHandler(log_queue)
+log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=logging.INFO, handlers=[log_queue_handler])
+logging.getLogger("app").setLevel(logging.DEBUG if settings.debug else logging.INFO)
+validation_logger = logging.getLogger("app.validation")
+websocket_logger = logging.getLogger("app.websocket")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release pooled connections to the OpenAI API
+    await close_http_client()
+    # Flush queued log records
+    log_listener.stop()
 
 app = FastAPI(
     title=settings.api_title,
     description=settings.api_description,
-    version=settings.api_version
+    version=settings.api_version,
+    lifespan=lifespan,
+    # orjson encodes responses in C instead of the pure-Python json module
+    default_response_class=ORJSONResponse
 )
 
+# Undelivered messages kept per WebSocket; a slow client loses its oldest ones first
+WEBSOCKET_QUEUE_SIZE = 128
+
+# Notifications produced within this many seconds are sent to a user in one frame
+WEBSOCKET_BATCH_WINDOW = 0.02
+
+# A send still blocked on a full transport buffer after this many seconds closes the connection
+WEBSOCKET_SEND_TIMEOUT = 10.0
+
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
+        # Outgoing message queue of each connection by id(websocket), drained by that
+        # connection's writer task; keying by id avoids hashing Starlette's Mapping-based WebSocket
+        self.active_connections: Dict[str, Dict[int, asyncio.Queue]] = {}
+        self.writer_tasks: Dict[int, asyncio.Task] = {}
+        # Messages waiting for the next batched frame of each user, and the task that sends it
+        self.pending_messages: Dict[str, List[dict]] = {}
+        self.flush_tasks: Dict[str, asyncio.Task] = {}
 
     async def connect(self, websocket: WebSocket, user_id: str):
         await websocket.accept()
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = set()
-        self.active_connections[user_id].add(websocket)
+        outgoing: asyncio.Queue = asyncio.Queue(maxsize=WEBSOCKET_QUEUE_SIZE)
+        self.active_connections.setdefault(user_id, {})[id(websocket)] = outgoing
+        self.writer_tasks[id(websocket)] = asyncio.create_task(self._write_messages(websocket, user_id, outgoing))
 
     def disconnect(self, websocket: WebSocket, user_id: str):
-        if user_id in self.active_connections:
-            self.active_connections[user_id].discard(websocket)
-            if not self.active_connections[user_id]:
+        user_connections = self.active_connections.get(user_id)
+        if user_connections is not None:
+            user_connections.pop(id(websocket), None)
+            if not user_connections:
                 del self.active_connections[user_id]
 
+        writer_task = self.writer_tasks.pop(id(websocket), None)
+        if writer_task and writer_task is not asyncio.current_task():
+            writer_task.cancel()
+
+    async def _write_messages(self, websocket: WebSocket, user_id: str, outgoing: asyncio.Queue):
+        """Send the queued messages of one connection so a slow client never delays the others"""
+        try:
+            while True:
+                message = await outgoing.get()
+                await asyncio.wait_for(websocket.send_bytes(message), WEBSOCKET_SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            # The client stopped reading; release its buffers instead of queueing behind it
+            websocket_logger.warning("⚠️ Closing stalled WebSocket of user %s", user_id)
+            self.disconnect(websocket, user_id)
+            try:
+                await websocket.close(code=1013)
+            except Exception:
+                pass
+        except Exception:
+            # Remove disconnected connection
+            self.disconnect(websocket, user_id)
+
     async def send_personal_message(self, message: dict, user_id: str):
         if user_id in self.active_connections:
-            disconnected_connections = []
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_text(json.dumps(message))
-                except:
-                    disconnected_connections.append(connection)
-
-            # Remove disconnected connections
-            for connection in disconnected_connections:
-                self.active_connections[user_id].discard(connection)
+            # Collect messages for a short window and send them to the user as one frame
+            self.pending_messages.setdefault(user_id, []).append(message)
+            if user_id not in self.flush_tasks:
+                self.flush_tasks[user_id] = asyncio.create_task(self._flush_after(user_id, WEBSOCKET_BATCH_WINDOW))
+
+    async def _flush_after(self, user_id: str, delay: float):
+        """Send the messages collected for a user as a single {"batch": [...]} frame"""
+        await asyncio.sleep(delay)
+        self.flush_tasks.pop(user_id, None)
+        messages = self.pending_messages.pop(user_id, None)
+        if not messages or user_id not in self.active_connections:
+            return
+
+        # Serialized once as UTF-8 JSON and sent as a binary frame to every connection
+        payload = orjson.dumps({"batch": messages})
+        for outgoing in list(self.active_connections[user_id].values()):
+            if outgoing.full():
+                # Latest wins: drop the oldest message a slow client hasn't received yet
+                outgoing.get_nowait()
+            outgoing.put_nowait(payload)
 
 manager = ConnectionManager()
 
@@ -54,28 +135,33 @@ notification_service.set_manager(manager)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
+    allow_origin_regex=settings.cors_origin_regex,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 # Exception handlers
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors with detailed information"""
+    validation_logger.debug("Validation error on %s %s: %s", request.method, request.url.path, exc.errors())
+
     # Convert validation errors to a serializable format
-    errors = []
-    for error in exc.errors():
-        error_dict = {
+    errors = [
+        {
             "type": error.get("type"),
             "loc": error.get("loc"),
             "msg": error.get("msg"),
-            "input": str(error.get("input")) if error.get("input") is not None else None,
+            "input": None if error.get("input") is None else str(error["input"]),
             "url": error.get("url")
         }
-        errors.append(error_dict)
+        for error in exc.errors()
+    ]
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={
             "detail": "Validation error",
@@ -99,10 +185,15 @@ app.include_router(dashboard.router, prefix="/api")
 async def websocket_endpoint(websocket: WebSocket, user_id: str):
     await manager.connect(websocket, user_id)
     try:
+        # Keep connection alive until the client leaves; raw receive() skips decoding any
+        # client frames, and uvicorn's protocol-level pings detect dead connections
         while True:
-            # Keep connection alive
-            await websocket.receive_text()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket, user_id)
 
 @app.get("/")
@@ -116,10 +207,23 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(
-        "main:app",
-        host=settings.host,
-        port=settings.port,
-        reload=settings.debug,
-        reload_dirs=["./app", "./"]
-    )
+    if settings.debug:
+        # Development: restart on code changes
+        uvicorn.run(
+            "main:app",
+            host=settings.host,
+            port=settings.port,
+            reload=True,
+            reload_dirs=["./app", "./"]
+        )
+    else:
+        # Single worker: WebSocket connections and the OpenAI rate limiter are per process
+        uvicorn.run(
+            "main:app",
+            host=settings.host,
+            port=settings.port,
+            loop="uvloop",
+            http="httptools",
+            # Notification frames are small; per-connection zlib contexts would cost more than they save
+            ws_per_message_deflate=False
+        )
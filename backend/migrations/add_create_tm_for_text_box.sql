@@ -0,0 +1,23 @@
+-- Migration: Create TM entries for text boxes in a single round trip
+-- This migration adds a function that resolves the series of a text box (text_boxes -> pages -> chapters)
+-- and inserts the translation memory entry atomically inside the database
+
+CREATE OR REPLACE FUNCTION create_tm_for_text_box(
+  p_text_box_id UUID,
+  p_source_text TEXT,
+  p_target_text TEXT,
+  p_context TEXT DEFAULT NULL
+)
+RETURNS SETOF translation_memory
+LANGUAGE sql
+AS $$
+  INSERT INTO translation_memory (series_id, source_text, target_text, context, usage_count, created_at, updated_at)
+  SELECT chapters.series_id, p_source_text, p_target_text, p_context, 0, now(), now()
+  FROM text_boxes
+  JOIN pages ON pages.id = text_boxes.page_id
+  JOIN chapters ON chapters.id = pages.chapter_id
+  WHERE text_boxes.id = p_text_box_id
+  RETURNING *;
+$$;
+
+COMMENT ON FUNCTION create_tm_for_text_box(UUID, TEXT, TEXT, TEXT) IS 'Create a translation memory entry in the series that owns the given text box';
@@ -0,0 +1,16 @@
+-- Migration: Atomic translation memory usage counting
+-- This migration adds a function that increments usage_count in a single UPDATE,
+-- replacing the read-then-write round trips that lose increments under concurrency
+
+CREATE OR REPLACE FUNCTION increment_tm_usage(p_id UUID)
+RETURNS SETOF translation_memory
+LANGUAGE sql
+AS $$
+  UPDATE translation_memory
+  SET usage_count = usage_count + 1,
+      updated_at = now()
+  WHERE id = p_id
+  RETURNING *;
+$$;
+
+COMMENT ON FUNCTION increment_tm_usage(UUID) IS 'Atomically increment the usage count of a translation memory entry';
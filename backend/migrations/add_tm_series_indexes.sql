@@ -0,0 +1,10 @@
+-- Migration: Composite indexes for per-series translation memory listings
+-- TM entries are always read per series, ordered by creation date (TM list page)
+-- or by usage count (analysis and TM scoring scans, ILIKE search fallback).
+-- These indexes let Postgres return them in order without sorting in memory
+
+CREATE INDEX IF NOT EXISTS idx_translation_memory_series_created
+  ON translation_memory (series_id, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_translation_memory_series_usage
+  ON translation_memory (series_id, usage_count DESC);
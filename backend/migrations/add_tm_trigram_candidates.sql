@@ -0,0 +1,48 @@
+-- Migration: Trigram candidate filtering for translation memory
+-- This migration lets the database return only plausible TM candidates for an OCR text
+-- instead of the backend scoring every translation_memory row of a series in Python
+
+-- Enable trigram matching
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- GIN trigram index used by the % and %> operators below
+CREATE INDEX IF NOT EXISTS idx_translation_memory_source_text_trgm
+  ON translation_memory USING gin (source_text gin_trgm_ops);
+
+-- Replace the earlier version without a similarity floor
+DROP FUNCTION IF EXISTS match_tm_candidates(UUID, TEXT, INTEGER);
+
+-- Return the TM entries of a series whose source text is most similar to p_text.
+-- Whole-text similarity (%) and word similarity in both directions (%>, <%) are all
+-- considered so that single words contained in a longer text are still returned;
+-- the backend refines these candidates with its own similarity scorer.
+-- The operators' cutoffs are lowered to p_min_similarity for the current transaction
+-- so candidates as weak as the backend's score threshold are not filtered out.
+CREATE OR REPLACE FUNCTION match_tm_candidates(
+  p_series_id UUID,
+  p_text TEXT,
+  p_limit INTEGER DEFAULT 20,
+  p_min_similarity REAL DEFAULT 0.3
+)
+RETURNS SETOF translation_memory
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  PERFORM set_config('pg_trgm.similarity_threshold', p_min_similarity::text, true);
+  PERFORM set_config('pg_trgm.word_similarity_threshold', p_min_similarity::text, true);
+
+  RETURN QUERY
+  SELECT *
+  FROM translation_memory
+  WHERE series_id = p_series_id
+    AND (source_text % p_text OR source_text %> p_text OR source_text <% p_text)
+  ORDER BY GREATEST(
+    similarity(source_text, p_text),
+    word_similarity(p_text, source_text),
+    word_similarity(source_text, p_text)
+  ) DESC
+  LIMIT p_limit;
+END;
+$$;
+
+COMMENT ON FUNCTION match_tm_candidates(UUID, TEXT, INTEGER, REAL) IS 'Top trigram-similar translation memory candidates for a text within a series';
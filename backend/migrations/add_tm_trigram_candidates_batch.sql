@@ -0,0 +1,27 @@
+-- Migration: Trigram candidate filtering for several texts at once
+-- This migration lets the backend fetch TM candidates for every text region of a page
+-- in one round trip. Requires match_tm_candidates from add_tm_trigram_candidates.sql
+
+-- Replace the earlier version without a similarity floor
+DROP FUNCTION IF EXISTS match_tm_candidates_batch(UUID, TEXT[], INTEGER);
+
+-- Return the union of the top p_limit candidates of each text in p_texts
+CREATE OR REPLACE FUNCTION match_tm_candidates_batch(
+  p_series_id UUID,
+  p_texts TEXT[],
+  p_limit INTEGER DEFAULT 20,
+  p_min_similarity REAL DEFAULT 0.3
+)
+RETURNS SETOF translation_memory
+LANGUAGE sql
+AS $$
+  SELECT *
+  FROM translation_memory
+  WHERE id IN (
+    SELECT candidate.id
+    FROM unnest(p_texts) AS query(text)
+    CROSS JOIN LATERAL match_tm_candidates(p_series_id, query.text, p_limit, p_min_similarity) AS candidate
+  );
+$$;
+
+COMMENT ON FUNCTION match_tm_candidates_batch(UUID, TEXT[], INTEGER, REAL) IS 'Union of the top trigram-similar translation memory candidates for several texts within a series';
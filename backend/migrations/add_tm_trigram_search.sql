@@ -0,0 +1,41 @@
+-- Migration: Trigram-backed translation memory search
+-- This migration indexes target_text for trigram matching and adds a search function
+-- that filters and ranks TM entries in the database instead of OR'ing two ILIKE filters
+
+-- Enable trigram matching
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- GIN trigram index for target_text (source_text is indexed by add_tm_trigram_candidates.sql);
+-- both also serve ILIKE '%...%' patterns
+CREATE INDEX IF NOT EXISTS idx_translation_memory_target_text_trgm
+  ON translation_memory USING gin (target_text gin_trgm_ops);
+
+-- Search the TM entries of a series by source or target text. Entries containing the
+-- query are returned as before, along with entries whose words are trigram-similar to it.
+-- Results are ranked by how closely either text matches, then by usage.
+CREATE OR REPLACE FUNCTION search_tm_entries(
+  p_series_id UUID,
+  p_query TEXT,
+  p_limit INTEGER DEFAULT 10
+)
+RETURNS SETOF translation_memory
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT *
+  FROM translation_memory
+  WHERE series_id = p_series_id
+    AND (
+      source_text ILIKE '%' || p_query || '%'
+      OR target_text ILIKE '%' || p_query || '%'
+      OR p_query <% source_text
+      OR p_query <% target_text
+    )
+  ORDER BY GREATEST(
+    word_similarity(p_query, source_text),
+    word_similarity(p_query, target_text)
+  ) DESC, usage_count DESC
+  LIMIT p_limit;
+$$;
+
+COMMENT ON FUNCTION search_tm_entries(UUID, TEXT, INTEGER) IS 'Translation memory entries of a series matching a search query, ranked by trigram similarity';
@@ -0,0 +1,23 @@
+-- Migration: Database-managed translation memory timestamps
+-- This migration lets the backend omit created_at/updated_at from TM writes:
+-- both columns default to now() on insert and a trigger bumps updated_at on update
+
+ALTER TABLE translation_memory
+  ALTER COLUMN created_at SET DEFAULT now(),
+  ALTER COLUMN updated_at SET DEFAULT now();
+
+CREATE OR REPLACE FUNCTION set_translation_memory_updated_at()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  NEW.updated_at = now();
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_translation_memory_updated_at ON translation_memory;
+CREATE TRIGGER trg_translation_memory_updated_at
+  BEFORE UPDATE ON translation_memory
+  FOR EACH ROW
+  EXECUTE FUNCTION set_translation_memory_updated_at();
@@ -7,11 +7,18 @@ const WS_BASE_URL =
     ""
   ) || "ws://localhost:8000";
 
+// Notifications arrive as UTF-8 encoded JSON in binary frames
+const textDecoder = new TextDecoder();
+
 export interface WebSocketMessage {
   type: string;
   data: any;
 }
 
+export interface WebSocketBatch {
+  batch: WebSocketMessage[];
+}
+
 export interface AutoExtractCompletedData {
   chapter_id: string;
   page_id: string;
@@ -76,6 +83,7 @@ class WebSocketService {
       console.log(`🔌 Connecting to WebSocket: ${wsUrl}`);
 
       this.ws = new WebSocket(wsUrl);
+      this.ws.binaryType = "arraybuffer";
 
       this.ws.onopen = () => {
         console.log("✅ WebSocket connected");
@@ -86,8 +94,14 @@ class WebSocketService {
 
       this.ws.onmessage = (event) => {
         try {
-          const message: WebSocketMessage = JSON.parse(event.data);
-          this.handleMessage(message);
+          const payload =
+            typeof event.data === "string"
+              ? event.data
+              : textDecoder.decode(event.data);
+          const frame: WebSocketMessage | WebSocketBatch = JSON.parse(payload);
+          // Messages sent close together arrive batched in one frame
+          const messages = "batch" in frame ? frame.batch : [frame];
+          messages.forEach((message) => this.handleMessage(message));
         } catch (error) {
           console.error("❌ Error parsing WebSocket message:", error);
         }